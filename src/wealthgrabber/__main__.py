@@ -1,4 +1,18 @@
-from .cli import app
+import sys
+
+from . import __version__
+
+
+def main() -> None:
+    """Run the CLI, answering a bare --version before importing typer."""
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        print(__version__)
+        return
+
+    from .cli import app
 
-if __name__ == "__main__":
     app()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
+import re
+import sys
+from typing import Optional, TextIO
+
 from ws_api import WealthsimpleAPI
 
 from .formatters import get_formatter
 from .models import AccountData
 
+# Keywords identifying non-liquid accounts, matched anywhere in the description
+_NON_LIQUID_RE = re.compile(r"rrsp|lira|private equity|private credit", re.IGNORECASE)
+
 
 def _extract_account_value(account: dict) -> tuple[float, str]:
     """Extract account value and currency from account data.
@@ -29,8 +36,7 @@ def _is_non_liquid_account(description: str) -> bool:
     Returns:
         True if account is non-liquid (RRSP, LIRA, Private Equity, Private Credit)
     """
-    non_liquid_keywords = ["rrsp", "lira", "private equity", "private credit"]
-    return any(keyword in description.lower() for keyword in non_liquid_keywords)
+    return _NON_LIQUID_RE.search(description) is not None
 
 
 def _should_include_account(
@@ -110,6 +116,7 @@ def print_accounts(
     not_liquid: bool = False,
     output_format: str = "table",
     verbose: bool = False,
+    out: Optional[TextIO] = None,
 ) -> None:
     """Fetch and print accounts.
 
@@ -120,16 +127,19 @@ def print_accounts(
         not_liquid: Whether to show only non-liquid accounts (RRSP, LIRA, Private Equity, Private Credit)
         output_format: Output format - 'table', 'json', or 'csv' (default 'table')
         verbose: If True, print status messages during execution
+        out: Stream to write output to (default sys.stdout)
     """
+    if out is None:
+        out = sys.stdout
+
     if verbose:
-        print("\nFetching accounts...")
+        print("\nFetching accounts...", file=out)
 
     accounts_data = get_accounts_data(ws, show_zero_balances, liquid_only, not_liquid)
 
     if not accounts_data:
-        print("No accounts found.")
+        print("No accounts found.", file=out)
         return
 
     formatter = get_formatter(output_format)
-    output = formatter.format_accounts(accounts_data)
-    print(output)
+    formatter.format_accounts(accounts_data, out)
@@ -1,26 +1,58 @@
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from itertools import groupby
+from operator import attrgetter
+from typing import Optional, TextIO
 
 from ws_api import WealthsimpleAPI
 
+from . import security_cache
 from .formatters import get_formatter
 from .models import ActivityData
+from .security_cache import prefetch
 
 DIVIDEND_TYPES = {"DIY_DIVIDEND", "DIVIDEND", "DISTRIBUTION"}
 
+# Single-scan fallback for DIVIDEND_TYPES ("DIVIDEND" also covers "DIY_DIVIDEND")
+_DIVIDEND_RE = re.compile(r"DIVIDEND|DISTRIBUTION", re.IGNORECASE)
+
+# Security IDs appear in descriptions as "sec-s-XXXX", sometimes wrapped in brackets
+_SEC_ID_RE = re.compile(r"\[?(sec-[a-z]-[a-f0-9]+)")
+_SEC_ID_SUB_RE = re.compile(r"\[?(sec-[a-z]-[a-f0-9]+)\]?")
+_BUY_QTY_RE = re.compile(r"buy (\d+\.?\d*)")
+
+# Upper bound on concurrent per-account activity fetches
+MAX_FETCH_WORKERS = 8
+
+# Smallest page requested from the API; ws_api drops rejected, cancelled and
+# expired activities client-side, so asking for exactly ``limit`` can come up short
+MIN_FETCH_SIZE = 50
+
+# Multi-account activities are always labelled, so no None guard is needed
+_account_label = attrgetter("account_label")
+
 
 def is_dividend_activity(activity: dict) -> bool:
     """Check if activity is a dividend."""
-    act_type = activity.get("type", "").upper()
-    description = activity.get("description", "").upper()
-    return any(div in act_type or div in description for div in DIVIDEND_TYPES)
+    act_type = activity.get("type", "")
+    if act_type.upper() in DIVIDEND_TYPES:
+        return True
+    return bool(
+        _DIVIDEND_RE.search(act_type)
+        or _DIVIDEND_RE.search(activity.get("description", ""))
+    )
 
 
 def get_account_id_by_number(ws: WealthsimpleAPI, account_number: str) -> Optional[str]:
-    """Look up account ID by account number."""
-    accounts = ws.get_accounts()
-    for account in accounts:
+    """Look up account ID by account number.
+
+    A linear scan over ``ws.get_accounts()``, which ws_api caches per client;
+    each command resolves a single number, so an index would not pay off.
+    If several accounts share a number, the first one wins.
+    """
+    for account in ws.get_accounts():
         if account.get("number") == account_number:
             return account.get("id")
     return None
@@ -35,7 +67,11 @@ def _get_security_name(ws: WealthsimpleAPI, security_id: str, cache: dict) -> st
 
     if security_id:
         try:
-            market_data = ws.get_security_market_data(security_id, use_cache=False)
+            market_data = security_cache.get_market_data(security_id)
+            if market_data is None:
+                market_data = ws.get_security_market_data(security_id, use_cache=False)
+                if market_data:
+                    security_cache.set_market_data(security_id, market_data)
             if market_data and market_data.get("stock"):
                 stock = market_data["stock"]
                 symbol = stock.get("symbol", "")
@@ -50,41 +86,61 @@ def _get_security_name(ws: WealthsimpleAPI, security_id: str, cache: dict) -> st
     return name
 
 
+def _get_direct_security_id(activity: dict) -> Optional[str]:
+    """Get the security ID an activity references directly, if any."""
+    security = activity.get("security")
+    if not security:
+        return None
+    return security.get("id") if isinstance(security, dict) else security
+
+
+def _get_activity_security_id(activity: dict) -> Optional[str]:
+    """Get the security ID _enhance_description will look up for an activity.
+
+    That is the direct security reference if present, otherwise the first ID
+    embedded in the description (its name replaces every embedded ID).
+    """
+    security_id = _get_direct_security_id(activity)
+    if security_id:
+        return security_id
+    match = _SEC_ID_RE.search(activity.get("description", ""))
+    return match.group(1) if match else None
+
+
 def _enhance_description(
     ws: WealthsimpleAPI, activity: dict, security_cache: dict
 ) -> str:
     """Enhance activity description by replacing security IDs with names."""
     description = activity.get("description", "N/A")
 
-    # First, check if the activity has a direct security reference
-    security = activity.get("security")
-    security_id = None
-
-    if security:
-        security_id = security.get("id") if isinstance(security, dict) else security
-
-    # If no direct security reference, try to extract from description
-    # Look for patterns like [sec-s-XXXX or sec-s-XXXX
-    if not security_id:
-        # Try to find security ID in description
-        match = re.search(r"\[?(sec-[a-z]-[a-f0-9]+)", description)
-        if match:
-            security_id = match.group(1)
+    # A direct security reference names every ID found in the description
+    security_id = _get_direct_security_id(activity)
+    security_name = (
+        _get_security_name(ws, security_id, security_cache) if security_id else None
+    )
 
-    if security_id:
-        security_name = _get_security_name(ws, security_id, security_cache)
-        # Replace the security ID with the name in the description
-        description = re.sub(r"\[?(sec-[a-z]-[a-f0-9]+)\]?", security_name, description)
-
-        # For DIY_BUY activities that might not have security in description,
-        # append the security name
-        if "DIY_BUY" in activity.get("type", "") and security_name not in description:
-            # Extract the quantity if present
-            qty_match = re.search(r"buy (\d+\.?\d*)", description)
-            if qty_match:
-                description = (
-                    f"Dividend reinvestment: buy {qty_match.group(1)} {security_name}"
-                )
+    # Look for patterns like [sec-s-XXXX or sec-s-XXXX and swap in names in one pass
+    def replace(match: re.Match) -> str:
+        nonlocal security_name
+        if not security_name:
+            security_name = _get_security_name(ws, match.group(1), security_cache)
+        return security_name
+
+    description = _SEC_ID_SUB_RE.sub(replace, description)
+
+    # For DIY_BUY activities that might not have security in description,
+    # append the security name
+    if (
+        security_name
+        and "DIY_BUY" in activity.get("type", "")
+        and security_name not in description
+    ):
+        # Extract the quantity if present
+        qty_match = _BUY_QTY_RE.search(description)
+        if qty_match:
+            description = (
+                f"Dividend reinvestment: buy {qty_match.group(1)} {security_name}"
+            )
 
     return description
 
@@ -124,38 +180,32 @@ def _transform_activity(
     )
 
 
-def _process_account_activities(
+def _fetch_account_activities(
     ws: WealthsimpleAPI,
     account_id: str,
-    account_label: Optional[str],
-    security_cache: dict,
     dividends_only: bool,
     limit: int,
-) -> list[ActivityData]:
-    """Process activities for a single account.
+) -> list[dict]:
+    """Fetch raw activities for a single account.
 
     Args:
         ws: Authenticated WealthsimpleAPI client
         account_id: Account ID to fetch activities for
-        account_label: Optional label for grouping (e.g., "TFSA (ACC-001)")
-        security_cache: Shared cache for security lookups
         dividends_only: Whether to filter for dividend activities only
         limit: Maximum number of activities to return
 
     Returns:
-        List of ActivityData objects for the account
+        List of raw activity dicts for the account
     """
-    activities = ws.get_activities(account_id)
+    if not dividends_only:
+        # The API has no type filter, so only unfiltered requests can be
+        # capped server-side
+        how_many = max(limit, MIN_FETCH_SIZE)
+        return ws.get_activities(account_id, how_many=how_many)[:limit]
 
-    if dividends_only:
-        activities = [a for a in activities if is_dividend_activity(a)]
+    activities = [a for a in ws.get_activities(account_id) if is_dividend_activity(a)]
 
-    activities = activities[:limit]
-
-    return [
-        _transform_activity(ws, act, security_cache, account_label)
-        for act in activities
-    ]
+    return activities[:limit]
 
 
 def get_activities_data(
@@ -175,30 +225,51 @@ def get_activities_data(
     Returns:
         List of ActivityData objects
     """
-    result = []
-    security_cache: dict[str, str] = {}
+    # (account_label, raw activity) pairs, in output order
+    labeled_activities: list[tuple[Optional[str], dict]] = []
 
     if account_id:
         # Single account mode: no account label
-        result = _process_account_activities(
-            ws, account_id, None, security_cache, dividends_only, limit
-        )
+        labeled_activities = [
+            (None, act)
+            for act in _fetch_account_activities(ws, account_id, dividends_only, limit)
+        ]
     else:
         # All accounts mode - fetch accounts for labeling
         accounts = ws.get_accounts()
         if not accounts:
             return []
 
-        for account in accounts:
-            acc_id = account.get("id")
-            acc_label = f"{account.get('description', 'Unknown')} ({account.get('number', 'N/A')})"
-            result.extend(
-                _process_account_activities(
-                    ws, acc_id, acc_label, security_cache, dividends_only, limit
-                )
+        def fetch(account: dict) -> list[dict]:
+            return _fetch_account_activities(
+                ws, account.get("id"), dividends_only, limit
             )
 
-    return result
+        # Fetch all accounts concurrently; map() keeps results in account order
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_FETCH_WORKERS, len(accounts))
+        ) as executor:
+            for account, activities in zip(accounts, executor.map(fetch, accounts)):
+                acc_label = f"{account.get('description', 'Unknown')} ({account.get('number', 'N/A')})"
+                labeled_activities.extend((acc_label, act) for act in activities)
+
+    # Resolve all referenced securities up front so the transform never blocks
+    security_cache: dict[str, str] = {}
+    security_ids: set[str] = set()
+    for _, act in labeled_activities:
+        security_id = _get_activity_security_id(act)
+        if security_id:
+            security_ids.add(security_id)
+    prefetch(
+        security_ids,
+        lambda security_id: _get_security_name(ws, security_id, {}),
+        security_cache,
+    )
+
+    return [
+        _transform_activity(ws, act, security_cache, acc_label)
+        for acc_label, act in labeled_activities
+    ]
 
 
 def print_activities(
@@ -208,6 +279,7 @@ def print_activities(
     limit: int = 50,
     output_format: str = "table",
     verbose: bool = False,
+    out: Optional[TextIO] = None,
 ) -> None:
     """Fetch and print activities.
 
@@ -218,61 +290,64 @@ def print_activities(
         limit: Maximum number of activities per account
         output_format: Output format - 'table', 'json', or 'csv' (default 'table')
         verbose: If True, print status messages during execution
+        out: Stream to write output to (default sys.stdout)
     """
+    if out is None:
+        out = sys.stdout
+
     if verbose:
-        print("\nFetching activities...")
+        print("\nFetching activities...", file=out)
 
     activities_data = get_activities_data(ws, account_id, dividends_only, limit)
 
     if not activities_data:
-        print("No activities found.")
+        print("No activities found.", file=out)
         return
 
     formatter = get_formatter(output_format)
 
     if output_format == "table":
         # For table format, group by account if multi-account
-        from itertools import groupby
-
         if not account_id:
             # Multi-account mode: group by account label
-            activities_data_sorted = sorted(
-                activities_data, key=lambda a: a.account_label or ""
-            )
+            activities_data_sorted = sorted(activities_data, key=_account_label)
 
             for account_label, group_iter in groupby(
-                activities_data_sorted, key=lambda a: a.account_label
+                activities_data_sorted, key=_account_label
             ):
-                group = list(group_iter)
-                # Print header with account label
+                # Header with account label
                 suffix = " - Dividends Only" if dividends_only else ""
-                print("\n" + "=" * 80)
+                lines = ["", "=" * 80]
                 if account_label:
-                    print(f"Account: {account_label}{suffix}")
-                print("=" * 80)
-                print(f"{'Date':<12} {'Type':<14} {'Description':<34} {'Amount':>18}")
-                print("-" * 80)
-
-                # Print activities using formatter (will skip account header)
-                for act in group:
-                    print(
-                        f"{act.date:<12} {act.activity_type:<14} {act.description:<34} "
-                        f"{act.sign}{act.amount:>14,.2f} {act.currency}"
-                    )
-
-            print("=" * 80)
+                    lines.append(f"Account: {account_label}{suffix}")
+                lines.append("=" * 80)
+                lines.append(
+                    f"{'Date':<12} {'Type':<14} {'Description':<34} {'Amount':>18}"
+                )
+                lines.append("-" * 80)
+
+                # Activity rows, written with the header in a single call
+                lines.extend(
+                    f"{act.date:<12} {act.activity_type:<14} {act.description:<34} "
+                    f"{act.sign}{act.amount:>14,.2f} {act.currency}"
+                    for act in group_iter
+                )
+                out.write("\n".join(lines) + "\n")
+
+            print("=" * 80, file=out)
         else:
             # Single account mode
-            output = formatter.format_activities(activities_data)
-            print(output)
+            formatter.format_activities(activities_data, out)
     else:
         # For JSON and CSV, use formatter directly
-        output = formatter.format_activities(activities_data)
-        print(output)
+        formatter.format_activities(activities_data, out)
 
 
 def _format_date(iso_date: str) -> str:
     """Format ISO date to YYYY-MM-DD."""
+    # Extended ISO 8601 already starts with the date, so skip the full parse
+    if len(iso_date) >= 10 and iso_date[4] == "-" and iso_date[7] == "-":
+        return iso_date[:10]
     try:
         dt = datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
         return dt.strftime("%Y-%m-%d")
@@ -1,10 +1,21 @@
+import sys
+from collections import defaultdict
 from itertools import groupby
-from typing import Optional
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional, TextIO
 
 from ws_api import WealthsimpleAPI
 
+from . import security_cache
 from .formatters import get_formatter
 from .models import PositionData
+from .security_cache import prefetch
+
+# C-level field getters so totals are reduced without a Python-level loop
+_market_value = attrgetter("market_value")
+_book_value = attrgetter("book_value")
+# Grouped positions always carry a label, so no None guard is needed
+_account_label = attrgetter("account_label")
 
 
 def _position_has_account(position: dict, account_id: str) -> bool:
@@ -13,12 +24,6 @@ def _position_has_account(position: dict, account_id: str) -> bool:
     return any(acc.get("id") == account_id for acc in accounts)
 
 
-def _get_position_account_ids(position: dict) -> list[str]:
-    """Get all account IDs associated with a position."""
-    accounts = position.get("accounts", [])
-    return [acc.get("id") for acc in accounts if acc.get("id")]
-
-
 def _get_security_info(
     ws: WealthsimpleAPI, security_id: str, cache: dict
 ) -> tuple[str, str]:
@@ -31,7 +36,11 @@ def _get_security_info(
 
     if security_id:
         try:
-            market_data = ws.get_security_market_data(security_id, use_cache=False)
+            market_data = security_cache.get_market_data(security_id)
+            if market_data is None:
+                market_data = ws.get_security_market_data(security_id, use_cache=False)
+                if market_data:
+                    security_cache.set_market_data(security_id, market_data)
             if market_data and market_data.get("stock"):
                 stock = market_data["stock"]
                 symbol = stock.get("symbol", "N/A")
@@ -45,11 +54,26 @@ def _get_security_info(
     return symbol, name
 
 
+def _get_position_values(position: dict) -> tuple[float, float, float]:
+    """Compute market value, book value and P&L from raw position data.
+
+    Args:
+        position: Raw position dict from API
+
+    Returns:
+        Tuple of (market_value, book_value, pnl)
+    """
+    market_value = float(position.get("totalValue", {}).get("amount", 0))
+    book_value = float(position.get("bookValue", {}).get("amount", 0))
+    return market_value, book_value, market_value - book_value
+
+
 def _get_position_data(
     ws: WealthsimpleAPI,
     position: dict,
     security_cache: dict[str, tuple[str, str]],
     currency: str,
+    account_label: Optional[str] = None,
 ) -> PositionData:
     """Extract and format position data including P&L calculation."""
     # Get security info
@@ -58,18 +82,11 @@ def _get_position_data(
     symbol, name = _get_security_info(ws, security_id, security_cache)
     name = name[:30]
 
-    # Extract quantity and market value
     quantity = float(position.get("quantity", 0))
-    total_val = position.get("totalValue", {})
-    market_value = float(total_val.get("amount", 0))
-    val_currency = total_val.get("currency", currency)
-
-    # Extract book value for P&L calculation
-    book_val = position.get("bookValue", {})
-    book_value = float(book_val.get("amount", 0))
+    val_currency = position.get("totalValue", {}).get("currency", currency)
 
     # Calculate P&L
-    pnl = market_value - book_value
+    market_value, book_value, pnl = _get_position_values(position)
     pnl_pct = (pnl / book_value * 100) if book_value != 0 else 0.0
 
     return PositionData(
@@ -81,6 +98,7 @@ def _get_position_data(
         currency=val_currency,
         pnl=pnl,
         pnl_pct=pnl_pct,
+        account_label=account_label,
     )
 
 
@@ -98,14 +116,14 @@ def _build_account_label(account: dict) -> str:
     return f"{description} ({number})"
 
 
-def _get_positions_by_account_grouped(
+def _iter_positions_by_account_grouped(
     ws: WealthsimpleAPI,
     positions: list,
     accounts: list,
     security_cache: dict,
     currency: str,
-) -> list[PositionData]:
-    """Get positions organized by account with labels.
+) -> Iterator[PositionData]:
+    """Yield positions organized by account with labels.
 
     Args:
         ws: Authenticated WealthsimpleAPI client
@@ -114,16 +132,17 @@ def _get_positions_by_account_grouped(
         security_cache: Cache for security lookups
         currency: Currency code
 
-    Returns:
-        List of PositionData objects with account labels
+    Yields:
+        PositionData objects with account labels
     """
     # Build position mapping by account
-    positions_by_account: dict[str, list] = {}
+    positions_by_account: defaultdict[str, list] = defaultdict(list)
     for pos in positions:
-        for acc_id in _get_position_account_ids(pos):
-            positions_by_account.setdefault(acc_id, []).append(pos)
+        for acc in pos.get("accounts", ()):
+            acc_id = acc.get("id")
+            if acc_id:
+                positions_by_account[acc_id].append(pos)
 
-    result = []
     for account in accounts:
         acc_id = account.get("id")
         acc_positions = positions_by_account.get(acc_id, [])
@@ -133,11 +152,23 @@ def _get_positions_by_account_grouped(
 
         acc_label = _build_account_label(account)
         for pos in acc_positions:
-            pos_data = _get_position_data(ws, pos, security_cache, currency)
-            pos_data.account_label = acc_label
-            result.append(pos_data)
+            yield _get_position_data(ws, pos, security_cache, currency, acc_label)
+
+
+def _matches_pnl_filter(position: dict, pnl_filter: Optional[str]) -> bool:
+    """Check if a raw position passes the P&L filter.
 
-    return result
+    Args:
+        position: Raw position dict from API
+        pnl_filter: "profit" (pnl > 0), "loss" (pnl < 0), or None (all)
+
+    Returns:
+        True if position should be included
+    """
+    if pnl_filter not in ("profit", "loss"):
+        return True
+    _, _, pnl = _get_position_values(position)
+    return pnl > 0 if pnl_filter == "profit" else pnl < 0
 
 
 def _filter_positions_by_account(positions: list, account_id: str) -> list:
@@ -196,33 +227,36 @@ def get_assets_data(
 
     if account_id:
         positions = _filter_positions_by_account(positions, account_id)
+
+    # Filter on the raw values so excluded positions never trigger security lookups
+    if pnl_filter:
+        positions = [p for p in positions if _matches_pnl_filter(p, pnl_filter)]
     if not positions:
         return []
 
     security_cache: dict[str, tuple[str, str]] = {}
+    prefetch(
+        (pos.get("security", {}).get("id", "") for pos in positions),
+        lambda security_id: _get_security_info(ws, security_id, {}),
+        security_cache,
+    )
 
+    position_data: Iterable[PositionData]
     if not by_account:
         # Aggregated view (all positions without account labels)
-        position_data = [
+        position_data = (
             _get_position_data(ws, pos, security_cache, currency) for pos in positions
-        ]
+        )
     else:
         # By-account view: get accounts and group positions
         accounts = _get_accounts_for_assets(ws, account_id)
         if not accounts:
             return []
-        position_data = _get_positions_by_account_grouped(
+        position_data = _iter_positions_by_account_grouped(
             ws, positions, accounts, security_cache, currency
         )
 
-    # Apply P&L filter if specified
-    if pnl_filter == "profit":
-        position_data = [pos for pos in position_data if pos.pnl > 0]
-    elif pnl_filter == "loss":
-        position_data = [pos for pos in position_data if pos.pnl < 0]
-    # If pnl_filter is None, return all positions (default behavior)
-
-    return position_data
+    return list(position_data)
 
 
 def _calculate_position_totals(
@@ -236,8 +270,8 @@ def _calculate_position_totals(
     Returns:
         Tuple of (total_value, total_pnl, total_pnl_pct)
     """
-    total_value = sum(p.market_value for p in positions)
-    total_book = sum(p.book_value for p in positions)
+    total_value = sum(map(_market_value, positions))
+    total_book = sum(map(_book_value, positions))
     total_pnl = total_value - total_book
     total_pnl_pct = (total_pnl / total_book * 100) if total_book != 0 else 0.0
     return total_value, total_pnl, total_pnl_pct
@@ -261,34 +295,34 @@ def _format_pnl_display(pnl: float, pnl_pct: float) -> tuple[str, str]:
 def _print_positions_by_account(
     formatter,
     positions_data: list[PositionData],
+    out: TextIO,
 ) -> None:
     """Print positions grouped by account with grand totals.
 
     Args:
         formatter: Output formatter instance
         positions_data: List of position data
+        out: Stream to write output to
     """
-    positions_sorted = sorted(positions_data, key=lambda p: p.account_label or "")
+    positions_sorted = sorted(positions_data, key=_account_label)
 
-    for account_label, group_iter in groupby(
-        positions_sorted, key=lambda p: p.account_label
-    ):
+    for account_label, group_iter in groupby(positions_sorted, key=_account_label):
         group = list(group_iter)
-        output = formatter.format_positions(
-            group, show_totals=True, group_label=account_label
+        formatter.format_positions(
+            group, out, show_totals=True, group_label=account_label
         )
-        print(output)
 
     # Print grand total
     total_value, total_pnl, total_pnl_pct = _calculate_position_totals(positions_data)
     pnl_str, pnl_pct_str = _format_pnl_display(total_pnl, total_pnl_pct)
     currency_str = positions_data[0].currency if positions_data else "CAD"
 
-    print("\n" + "=" * 94)
+    print("\n" + "=" * 94, file=out)
     print(
-        f"{'Grand Total':<51} {total_value:>13,.2f} {currency_str} {pnl_str:>13} {pnl_pct_str:>8}"
+        f"{'Grand Total':<51} {total_value:>13,.2f} {currency_str} {pnl_str:>13} {pnl_pct_str:>8}",
+        file=out,
     )
-    print("=" * 94)
+    print("=" * 94, file=out)
 
 
 def print_assets(
@@ -299,6 +333,7 @@ def print_assets(
     output_format: str = "table",
     verbose: bool = False,
     pnl_filter: Optional[str] = None,
+    out: Optional[TextIO] = None,
 ) -> None:
     """Fetch and print asset positions.
 
@@ -310,21 +345,24 @@ def print_assets(
         output_format: Output format - 'table', 'json', or 'csv' (default 'table')
         verbose: If True, print status messages during execution
         pnl_filter: Optional filter by P&L - "profit" (pnl > 0), "loss" (pnl < 0), or None (all)
+        out: Stream to write output to (default sys.stdout)
     """
+    if out is None:
+        out = sys.stdout
+
     if verbose:
-        print("\nFetching positions...")
+        print("\nFetching positions...", file=out)
 
     positions_data = get_assets_data(ws, account_id, by_account, currency, pnl_filter)
 
     if not positions_data:
-        print("No positions found.")
+        print("No positions found.", file=out)
         return
 
     formatter = get_formatter(output_format)
 
     if by_account and output_format == "table":
-        _print_positions_by_account(formatter, positions_data)
+        _print_positions_by_account(formatter, positions_data, out)
     else:
         # For non-table formats or aggregated mode, use formatter directly
-        output = formatter.format_positions(positions_data, show_totals=True)
-        print(output)
+        formatter.format_positions(positions_data, out, show_totals=True)
@@ -12,10 +12,35 @@ from ws_api import (
 # Constants
 KEYRING_SERVICE = "wealthsimple-account-viewer"
 
+# Keyring values read during this process, keyed by (service, key). Each
+# backend read can be a D-Bus round-trip, and values only change through
+# the write/delete helpers below, which keep this in sync.
+_keyring_cache: dict[tuple[str, str], Optional[str]] = {}
+
+
+def _keyring_get(service: str, key: str) -> Optional[str]:
+    """Read a keyring value, reusing earlier reads in this process."""
+    cache_key = (service, key)
+    if cache_key not in _keyring_cache:
+        _keyring_cache[cache_key] = keyring.get_password(service, key)
+    return _keyring_cache[cache_key]
+
+
+def _keyring_set(service: str, key: str, value: str) -> None:
+    """Write a keyring value and update the read cache."""
+    keyring.set_password(service, key, value)
+    _keyring_cache[(service, key)] = value
+
+
+def _keyring_delete(service: str, key: str) -> None:
+    """Delete a keyring value and drop it from the read cache."""
+    _keyring_cache.pop((service, key), None)
+    keyring.delete_password(service, key)
+
 
 def _persist_session(session_json, username):
     """Save session to keyring"""
-    keyring.set_password(f"{KEYRING_SERVICE}.{username}", "session", session_json)
+    _keyring_set(f"{KEYRING_SERVICE}.{username}", "session", session_json)
 
 
 def _get_username(username: Optional[str] = None, verbose: bool = False) -> str:
@@ -25,7 +50,7 @@ def _get_username(username: Optional[str] = None, verbose: bool = False) -> str:
         return username
 
     # Otherwise, try cached email
-    cached_email = keyring.get_password(KEYRING_SERVICE, "last_email")
+    cached_email = _keyring_get(KEYRING_SERVICE, "last_email")
     if cached_email:
         if verbose:
             print(f"Using cached email: {cached_email}")
@@ -40,7 +65,7 @@ def _try_restore_session(
     username: str, verbose: bool = False
 ) -> Optional[WealthsimpleAPI]:
     """Try to restore an existing session from keyring. Returns None if not available/invalid."""
-    session_json = keyring.get_password(f"{KEYRING_SERVICE}.{username}", "session")
+    session_json = _keyring_get(f"{KEYRING_SERVICE}.{username}", "session")
     if not session_json:
         return None
 
@@ -49,7 +74,8 @@ def _try_restore_session(
         if verbose:
             print("✓ Found existing session, attempting to use it...")
         ws = WealthsimpleAPI.from_token(session, _persist_session, username)
-        ws.get_accounts()  # Test the session
+        # Test the session; ws_api caches the result for the command
+        ws.get_accounts()
         if verbose:
             print("✓ Session is valid")
         return ws
@@ -73,16 +99,14 @@ def _perform_login(username: str, verbose: bool = False) -> Optional[Wealthsimpl
                 username, password, otp_answer, persist_session_fct=_persist_session
             )
 
-            session_json = keyring.get_password(
-                f"{KEYRING_SERVICE}.{username}", "session"
-            )
+            session_json = _keyring_get(f"{KEYRING_SERVICE}.{username}", "session")
             session = WSAPISession.from_json(session_json)
             ws = WealthsimpleAPI.from_token(session, _persist_session, username)
             if verbose:
                 print("✓ Successfully authenticated")
 
             # Cache the email after successful login
-            keyring.set_password(KEYRING_SERVICE, "last_email", username)
+            _keyring_set(KEYRING_SERVICE, "last_email", username)
 
             return ws
 
@@ -131,7 +155,7 @@ def logout(username: Optional[str] = None, clear_email: bool = False) -> None:
     """
     # Get username to clear
     if username is None:
-        username = keyring.get_password(KEYRING_SERVICE, "last_email")
+        username = _keyring_get(KEYRING_SERVICE, "last_email")
         if not username:
             print("No cached session found.")
             return
@@ -139,7 +163,7 @@ def logout(username: Optional[str] = None, clear_email: bool = False) -> None:
     # Clear session for this username
     session_key = f"{KEYRING_SERVICE}.{username}"
     try:
-        keyring.delete_password(session_key, "session")
+        _keyring_delete(session_key, "session")
         print(f"✓ Cleared session for {username}")
     except keyring.errors.PasswordDeleteError:
         print(f"No session found for {username}")
@@ -147,7 +171,7 @@ def logout(username: Optional[str] = None, clear_email: bool = False) -> None:
     # Optionally clear cached email
     if clear_email:
         try:
-            keyring.delete_password(KEYRING_SERVICE, "last_email")
+            _keyring_delete(KEYRING_SERVICE, "last_email")
             print("✓ Cleared cached email")
         except keyring.errors.PasswordDeleteError:
             pass
@@ -1,23 +1,18 @@
-from enum import Enum
 from typing import Optional
 
+import click
 import typer
 
-from .accounts import print_accounts
-from .activities import get_account_id_by_number, print_activities
-from .assets import print_assets
-from .auth import get_authenticated_client
-from .auth import logout as auth_logout
+from . import __version__
 
-app = typer.Typer(help="Wealthsimple Account Viewer CLI", no_args_is_help=True)
+# Command modules (and the ws_api/requests stack behind them) are imported
+# inside each command, so --help and argument errors stay fast.
 
+app = typer.Typer(help="Wealthsimple Account Viewer CLI", no_args_is_help=True)
 
-class OutputFormat(str, Enum):
-    """Output format options."""
 
-    table = "table"
-    json = "json"
-    csv = "csv"
+# Output format options, passed through to get_formatter() as plain strings
+OUTPUT_FORMATS = ("table", "json", "csv")
 
 
 @app.command()
@@ -36,6 +31,8 @@ def login(
     """
     Authenticate with Wealthsimple and save the session.
     """
+    from .auth import get_authenticated_client
+
     verbose = ctx.obj.get("verbose") if ctx.obj else False
     ws = get_authenticated_client(force_login=force, username=username, verbose=verbose)
     if ws:
@@ -60,6 +57,8 @@ def logout(
     """
     Clear stored session and optionally cached email.
     """
+    from .auth import logout as auth_logout
+
     auth_logout(username=username, clear_email=clear_email)
 
 
@@ -81,13 +80,20 @@ def list_accounts_cmd(
         "-n",
         help="Show only non-liquid accounts (RRSP, LIRA, Private Equity, Private Credit).",
     ),
-    output_format: OutputFormat = typer.Option(
-        OutputFormat.table, "--format", "-f", help="Output format."
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        click_type=click.Choice(OUTPUT_FORMATS),
+        help="Output format.",
     ),
 ):
     """
     List all accounts with their numbers and current values.
     """
+    from .accounts import print_accounts
+    from .auth import get_authenticated_client
+
     verbose = ctx.obj.get("verbose") if ctx.obj else False
     ws = get_authenticated_client(verbose=verbose)
     if not ws:
@@ -100,7 +106,7 @@ def list_accounts_cmd(
             show_zero_balances=show_zero_balances,
             liquid_only=liquid_only,
             not_liquid=not_liquid,
-            output_format=output_format.value,
+            output_format=output_format,
             verbose=verbose,
         )
     except Exception as e:
@@ -120,13 +126,20 @@ def activities(
     limit: int = typer.Option(
         50, "--limit", "-n", help="Maximum number of activities per account."
     ),
-    output_format: OutputFormat = typer.Option(
-        OutputFormat.table, "--format", "-f", help="Output format."
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        click_type=click.Choice(OUTPUT_FORMATS),
+        help="Output format.",
     ),
 ):
     """
     List activities/transactions for your accounts.
     """
+    from .activities import get_account_id_by_number, print_activities
+    from .auth import get_authenticated_client
+
     verbose = ctx.obj.get("verbose") if ctx.obj else False
     ws = get_authenticated_client(verbose=verbose)
     if not ws:
@@ -146,7 +159,7 @@ def activities(
             account_id=account_id,
             dividends_only=dividends_only,
             limit=limit,
-            output_format=output_format.value,
+            output_format=output_format,
             verbose=verbose,
         )
     except typer.Exit:
@@ -180,13 +193,21 @@ def assets(
         "-l",
         help="Show only positions with loss (P&L < 0).",
     ),
-    output_format: OutputFormat = typer.Option(
-        OutputFormat.table, "--format", "-f", help="Output format."
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        click_type=click.Choice(OUTPUT_FORMATS),
+        help="Output format.",
     ),
 ):
     """
     List all asset positions across your accounts.
     """
+    from .activities import get_account_id_by_number
+    from .assets import print_assets
+    from .auth import get_authenticated_client
+
     verbose = ctx.obj.get("verbose") if ctx.obj else False
     ws = get_authenticated_client(verbose=verbose)
     if not ws:
@@ -217,7 +238,7 @@ def assets(
             ws,
             account_id=account_id,
             by_account=by_account,
-            output_format=output_format.value,
+            output_format=output_format,
             verbose=verbose,
             pnl_filter=pnl_filter,
         )
@@ -228,12 +249,27 @@ def assets(
         raise typer.Exit(code=1)
 
 
+def _version_callback(value: bool):
+    """Print the version and exit."""
+    if value:
+        print(__version__)
+        raise typer.Exit()
+
+
 @app.callback()
 def main(
     ctx: typer.Context,
     verbose: bool = typer.Option(
         False, "--verbose", "-v", help="Show detailed status messages during execution."
     ),
+    version: bool = typer.Option(
+        False,
+        "--version",
+        "-V",
+        callback=_version_callback,
+        is_eager=True,
+        help="Show the version and exit.",
+    ),
 ):
     """
     Wealthsimple Account Viewer CLI
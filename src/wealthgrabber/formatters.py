@@ -2,49 +2,161 @@
 
 import csv
 import json
-from dataclasses import asdict
-from io import StringIO
-from typing import Optional, Protocol, Sequence
+from dataclasses import fields
+from itertools import groupby
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, Optional, Protocol, Sequence, TextIO
 
 from .models import AccountData, ActivityData, PositionData
 
+try:
+    import orjson
+except ImportError:  # optional speedup, installed with the "fast" extra
+    orjson = None
+
+# Table rules and column headings, each a complete output line
+_SEP80 = "=" * 80 + "\n"
+_DASH80 = "-" * 80 + "\n"
+_SEP94 = "=" * 94 + "\n"
+_DASH94 = "-" * 94 + "\n"
+_ACC_HEADER = f"{'Account':<40} {'Number':<20} {'Value':>18}\n"
+_ACT_HEADER = f"{'Date':<12} {'Type':<14} {'Description':<34} {'Amount':>18}\n"
+_POS_HEADER = (
+    f"{'Symbol':<10} {'Name':<30} {'Qty':>10} "
+    f"{'Market Value':>16} {'P&L':>14} {'P&L %':>8}\n"
+)
+
+# Table row templates, parsed once; the "+" sign flag marks non-negative P&L
+_ACCOUNT_ROW = "{0.description:<40} {0.number:<20} {0.value:>15,.2f} {0.currency}\n"
+_ACTIVITY_ROW = (
+    "{0.date:<12} {0.activity_type:<14} {0.description:<34} "
+    "{0.sign}{0.amount:>14,.2f} {0.currency}\n"
+)
+_POSITION_ROW = (
+    "{0.symbol:<10} {0.name:<30} {0.quantity:>10.2f} "
+    "{0.market_value:>12,.2f} {0.currency} {0.pnl:>+13,.2f} {0.pnl_pct:>+7.1f}%\n"
+)
+_TOTALS_ROW = "{:<51} {:>13,.2f} {} {:>+13,.2f} {:>+7.1f}%"
+
+# Grouping key for runs of activity rows from the same account
+_account_label = attrgetter("account_label")
+
+# C-level field getters; sum() over them is compensated on Python 3.12+, so
+# totals match the ones computed in assets.py
+_market_value = attrgetter("market_value")
+_book_value = attrgetter("book_value")
+_quantity = attrgetter("quantity")
+
+# Field names of each model, in declaration order. They double as the CSV
+# headers, and the matching getters feed csv.writer.writerows() and the JSON
+# row dicts (the slotted models have no __dict__).
+_ACCOUNT_FIELDS = tuple(f.name for f in fields(AccountData))
+_ACTIVITY_FIELDS = tuple(f.name for f in fields(ActivityData))
+_POSITION_FIELDS = tuple(f.name for f in fields(PositionData))
+_ACCOUNT_VALUES = attrgetter(*_ACCOUNT_FIELDS)
+_ACTIVITY_VALUES = attrgetter(*_ACTIVITY_FIELDS)
+_POSITION_VALUES = attrgetter(*_POSITION_FIELDS)
+
 
 def _calculate_position_totals(
     positions: Sequence[PositionData],
-) -> tuple[float, float, float, float]:
-    """Calculate total position values and P&L.
+) -> tuple[float, float, float, float, float]:
+    """Calculate total position values, P&L and quantity.
 
     Args:
         positions: Sequence of positions
 
     Returns:
-        Tuple of (total_value, total_book, total_pnl, total_pnl_pct)
+        Tuple of (total_value, total_book, total_pnl, total_pnl_pct, total_quantity)
     """
-    total_value = sum(p.market_value for p in positions)
-    total_book = sum(p.book_value for p in positions)
+    total_value = sum(map(_market_value, positions))
+    total_book = sum(map(_book_value, positions))
+    total_quantity = sum(map(_quantity, positions))
     total_pnl = total_value - total_book
     total_pnl_pct = (total_pnl / total_book * 100) if total_book != 0 else 0.0
-    return total_value, total_book, total_pnl, total_pnl_pct
+    return total_value, total_book, total_pnl, total_pnl_pct, total_quantity
+
+
+def _record_dicts(
+    records: Iterable, names: tuple[str, ...], values: Callable[..., tuple]
+) -> Iterator[dict]:
+    """Yield a shallow field-name dict for each record.
+
+    Args:
+        records: Model instances
+        names: Field names of the model, in declaration order
+        values: Getter returning the record's values in the same order
+
+    Yields:
+        Dict of field name to value for each record
+    """
+    for record in records:
+        yield dict(zip(names, values(record)))
+
+
+def _stdlib_dumps(obj) -> str:
+    """Serialize to 2-space indented JSON."""
+    return json.dumps(obj, indent=2)
+
+
+def _orjson_dumps(obj) -> str:
+    """Serialize to 2-space indented JSON with orjson.
+
+    Text containing non-ASCII characters goes through the stdlib instead, so
+    it keeps its \\u escapes and prints on any stdout encoding. The remaining
+    differences from _stdlib_dumps: NaN/Infinity become null, and some floats
+    below 1e-4 use another notation for the same value (0.000015 vs 1.5e-05).
+    """
+    text = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return text if text.isascii() else _stdlib_dumps(obj)
+
+
+# orjson is used when installed through the "fast" extra
+_dumps = _orjson_dumps if orjson is not None else _stdlib_dumps
+
+
+def _write_json_array(out: TextIO, items: Iterable[dict], indent: str = "") -> None:
+    """Write items as an indented JSON array, one element at a time.
+
+    Produces the same text as dumping ``list(items)`` with indent=2, nested at
+    the given indent, without building the whole document first.
+
+    Args:
+        out: Stream to write to
+        items: JSON-serializable dicts
+        indent: Indentation of the line holding the array
+    """
+    item_indent = indent + "  "
+    first = True
+    for item in items:
+        out.write("[\n" if first else ",\n")
+        out.write(item_indent)
+        out.write(_dumps(item).replace("\n", "\n" + item_indent))
+        first = False
+    out.write("[]" if first else f"\n{indent}]")
 
 
 class FormatterProtocol(Protocol):
     """Protocol for data formatters."""
 
-    def format_accounts(self, accounts: Sequence[AccountData]) -> str:
-        """Format account data."""
+    def format_accounts(self, accounts: Sequence[AccountData], out: TextIO) -> None:
+        """Write formatted account data to a stream."""
         ...
 
-    def format_activities(self, activities: Sequence[ActivityData]) -> str:
-        """Format activity data."""
+    def format_activities(
+        self, activities: Sequence[ActivityData], out: TextIO
+    ) -> None:
+        """Write formatted activity data to a stream."""
         ...
 
     def format_positions(
         self,
         positions: Sequence[PositionData],
+        out: TextIO,
         show_totals: bool = True,
         group_label: Optional[str] = None,
-    ) -> str:
-        """Format position data."""
+    ) -> None:
+        """Write formatted position data to a stream."""
         ...
 
 
@@ -61,12 +173,7 @@ class TableFormatter:
         Returns:
             Formatted row string
         """
-        pnl_str = f"{'+' if pos.pnl >= 0 else ''}{pos.pnl:,.2f}"
-        pnl_pct_str = f"{'+' if pos.pnl_pct >= 0 else ''}{pos.pnl_pct:.1f}%"
-        return (
-            f"{pos.symbol:<10} {pos.name:<30} {pos.quantity:>10.2f} "
-            f"{pos.market_value:>12,.2f} {pos.currency} {pnl_str:>13} {pnl_pct_str:>8}"
-        )
+        return _POSITION_ROW.format(pos).rstrip("\n")
 
     @staticmethod
     def _format_totals_row(
@@ -88,268 +195,216 @@ class TableFormatter:
         Returns:
             Formatted totals row
         """
-        pnl_str = f"{'+' if total_pnl >= 0 else ''}{total_pnl:,.2f}"
-        pnl_pct_str = f"{'+' if total_pnl_pct >= 0 else ''}{total_pnl_pct:.1f}%"
-        return f"{label:<51} {total_value:>13,.2f} {currency} {pnl_str:>13} {pnl_pct_str:>8}"
+        return _TOTALS_ROW.format(
+            label, total_value, currency, total_pnl, total_pnl_pct
+        )
 
-    def format_accounts(self, accounts: Sequence[AccountData]) -> str:
-        """Format accounts as table with totals."""
+    @staticmethod
+    def format_accounts(accounts: Sequence[AccountData], out: TextIO) -> None:
+        """Write accounts as table with totals."""
         if not accounts:
-            return "No accounts found."
+            out.write("No accounts found.\n")
+            return
 
-        lines = []
-        lines.append("\n" + "=" * 80)
-        lines.append(f"{'Account':<40} {'Number':<20} {'Value':>18}")
-        lines.append("-" * 80)
+        out.write("\n" + _SEP80)
+        out.write(_ACC_HEADER)
+        out.write(_DASH80)
 
         total_value = 0.0
         for acc in accounts:
-            lines.append(
-                f"{acc.description:<40} {acc.number:<20} "
-                f"{acc.value:>15,.2f} {acc.currency}"
-            )
+            out.write(_ACCOUNT_ROW.format(acc))
             total_value += acc.value
 
-        lines.append("=" * 80)
-        lines.append(f"{'Total':<61} {total_value:>15,.2f} CAD")
-        lines.append("=" * 80)
-
-        return "\n".join(lines)
+        out.write(_SEP80)
+        out.write(f"{'Total':<61} {total_value:>15,.2f} CAD\n")
+        out.write(_SEP80)
 
-    def format_activities(self, activities: Sequence[ActivityData]) -> str:
-        """Format activities as table."""
+    @staticmethod
+    def format_activities(activities: Sequence[ActivityData], out: TextIO) -> None:
+        """Write activities as table."""
         if not activities:
-            return "No activities found."
+            out.write("No activities found.\n")
+            return
 
-        lines = []
         current_account = None
 
-        for act in activities:
+        # Activities arrive grouped by account, so headers are decided once per
+        # run of rows sharing a label rather than on every row
+        for account_label, group in groupby(activities, key=_account_label):
             # Print account header if account changes
-            if act.account_label and act.account_label != current_account:
+            if account_label and account_label != current_account:
                 if current_account is not None:
-                    lines.append("=" * 80)
-                lines.append("\n" + "=" * 80)
-                lines.append(f"Account: {act.account_label}")
-                lines.append("=" * 80)
-                lines.append(
-                    f"{'Date':<12} {'Type':<14} {'Description':<34} {'Amount':>18}"
-                )
-                lines.append("-" * 80)
-                current_account = act.account_label
+                    out.write(_SEP80)
+                out.write("\n" + _SEP80)
+                out.write(f"Account: {account_label}\n")
+                out.write(_SEP80)
+                out.write(_ACT_HEADER)
+                out.write(_DASH80)
+                current_account = account_label
             elif current_account is None:
                 # First activity, no account label
-                lines.append("\n" + "=" * 80)
-                lines.append(
-                    f"{'Date':<12} {'Type':<14} {'Description':<34} {'Amount':>18}"
-                )
-                lines.append("-" * 80)
+                out.write("\n" + _SEP80)
+                out.write(_ACT_HEADER)
+                out.write(_DASH80)
                 current_account = ""
 
-            lines.append(
-                f"{act.date:<12} {act.activity_type:<14} {act.description:<34} "
-                f"{act.sign}{act.amount:>14,.2f} {act.currency}"
-            )
+            out.writelines(map(_ACTIVITY_ROW.format, group))
 
-        lines.append("=" * 80)
-        return "\n".join(lines)
+        out.write(_SEP80)
 
+    @staticmethod
     def format_positions(
-        self,
         positions: Sequence[PositionData],
+        out: TextIO,
         show_totals: bool = True,
         group_label: Optional[str] = None,
-    ) -> str:
-        """Format positions as table with P&L."""
+    ) -> None:
+        """Write positions as table with P&L."""
         if not positions:
-            return "No positions found."
-
-        lines = []
+            out.write("No positions found.\n")
+            return
 
         # Header
+        out.write("\n" + _SEP94)
         if group_label:
-            lines.append("\n" + "=" * 94)
-            lines.append(f"Account: {group_label}")
-            lines.append("=" * 94)
-        else:
-            lines.append("\n" + "=" * 94)
-
-        lines.append(
-            f"{'Symbol':<10} {'Name':<30} {'Qty':>10} "
-            f"{'Market Value':>16} {'P&L':>14} {'P&L %':>8}"
-        )
-        lines.append("-" * 94)
+            out.write(f"Account: {group_label}\n")
+            out.write(_SEP94)
+
+        out.write(_POS_HEADER)
+        out.write(_DASH94)
 
         # Position rows
-        for pos in positions:
-            lines.append(self._format_position_row(pos))
+        out.writelines(map(_POSITION_ROW.format, positions))
 
         # Totals
         if show_totals:
-            total_value, total_book, total_pnl, total_pnl_pct = (
-                _calculate_position_totals(positions)
+            total_value, _, total_pnl, total_pnl_pct, _ = _calculate_position_totals(
+                positions
             )
             label = "Account Total" if group_label else "Total"
             currency = positions[0].currency if positions else "CAD"
 
-            lines.append("=" * 94)
-            lines.append(
-                self._format_totals_row(
+            out.write(_SEP94)
+            out.write(
+                TableFormatter._format_totals_row(
                     total_value, total_pnl, total_pnl_pct, label, currency
                 )
+                + "\n"
             )
-            lines.append("=" * 94)
-
-        return "\n".join(lines)
+            out.write(_SEP94)
 
 
 class JsonFormatter:
     """Format data as JSON."""
 
-    def format_accounts(self, accounts: Sequence[AccountData]) -> str:
-        """Format accounts as JSON array."""
-        return json.dumps([asdict(acc) for acc in accounts], indent=2)
+    @staticmethod
+    def format_accounts(accounts: Sequence[AccountData], out: TextIO) -> None:
+        """Write accounts as JSON array."""
+        _write_json_array(
+            out, _record_dicts(accounts, _ACCOUNT_FIELDS, _ACCOUNT_VALUES)
+        )
+        out.write("\n")
 
-    def format_activities(self, activities: Sequence[ActivityData]) -> str:
-        """Format activities as JSON array."""
-        return json.dumps([asdict(act) for act in activities], indent=2)
+    @staticmethod
+    def format_activities(activities: Sequence[ActivityData], out: TextIO) -> None:
+        """Write activities as JSON array."""
+        _write_json_array(
+            out, _record_dicts(activities, _ACTIVITY_FIELDS, _ACTIVITY_VALUES)
+        )
+        out.write("\n")
 
+    @staticmethod
     def format_positions(
-        self,
         positions: Sequence[PositionData],
+        out: TextIO,
         show_totals: bool = True,
         group_label: Optional[str] = None,
-    ) -> str:
-        """Format positions as JSON with optional totals."""
-        data = [asdict(pos) for pos in positions]
+    ) -> None:
+        """Write positions as JSON with optional totals."""
+        if not (show_totals and positions):
+            _write_json_array(
+                out, _record_dicts(positions, _POSITION_FIELDS, _POSITION_VALUES)
+            )
+            out.write("\n")
+            return
+
+        out.write('{\n  "positions": ')
+        _write_json_array(
+            out,
+            _record_dicts(positions, _POSITION_FIELDS, _POSITION_VALUES),
+            indent="  ",
+        )
 
-        if show_totals and positions:
-            total_value = sum(p.market_value for p in positions)
-            total_book = sum(p.book_value for p in positions)
-            total_pnl = total_value - total_book
-            total_pnl_pct = (total_pnl / total_book * 100) if total_book != 0 else 0.0
-
-            result = {
-                "positions": data,
-                "totals": {
-                    "market_value": total_value,
-                    "book_value": total_book,
-                    "pnl": total_pnl,
-                    "pnl_pct": total_pnl_pct,
-                    "currency": positions[0].currency if positions else "CAD",
-                },
-            }
-            if group_label:
-                result["group"] = group_label
-            return json.dumps(result, indent=2)
-
-        return json.dumps(data, indent=2)
+        total_value, total_book, total_pnl, total_pnl_pct, _ = (
+            _calculate_position_totals(positions)
+        )
+        totals = {
+            "market_value": total_value,
+            "book_value": total_book,
+            "pnl": total_pnl,
+            "pnl_pct": total_pnl_pct,
+            "currency": positions[0].currency if positions else "CAD",
+        }
+        out.write(',\n  "totals": ')
+        out.write(_dumps(totals).replace("\n", "\n  "))
+        if group_label:
+            out.write(',\n  "group": ' + _dumps(group_label))
+        out.write("\n}\n")
 
 
 class CsvFormatter:
     """Format data as CSV."""
 
-    def format_accounts(self, accounts: Sequence[AccountData]) -> str:
-        """Format accounts as CSV."""
+    @staticmethod
+    def format_accounts(accounts: Sequence[AccountData], out: TextIO) -> None:
+        """Write accounts as CSV."""
         if not accounts:
-            return ""
+            return
 
-        output = StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(out)
 
         # Write header
-        writer.writerow(["description", "number", "value", "currency"])
+        writer.writerow(_ACCOUNT_FIELDS)
 
-        # Write data
-        for acc in accounts:
-            writer.writerow([acc.description, acc.number, acc.value, acc.currency])
+        # Write data (csv writes None as an empty field)
+        writer.writerows(map(_ACCOUNT_VALUES, accounts))
 
-        return output.getvalue()
-
-    def format_activities(self, activities: Sequence[ActivityData]) -> str:
-        """Format activities as CSV."""
+    @staticmethod
+    def format_activities(activities: Sequence[ActivityData], out: TextIO) -> None:
+        """Write activities as CSV."""
         if not activities:
-            return ""
+            return
 
-        output = StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(out)
 
         # Write header
-        writer.writerow(
-            [
-                "date",
-                "activity_type",
-                "description",
-                "amount",
-                "currency",
-                "sign",
-                "account_label",
-            ]
-        )
+        writer.writerow(_ACTIVITY_FIELDS)
 
-        # Write data
-        for act in activities:
-            writer.writerow(
-                [
-                    act.date,
-                    act.activity_type,
-                    act.description,
-                    act.amount,
-                    act.currency,
-                    act.sign,
-                    act.account_label or "",
-                ]
-            )
-
-        return output.getvalue()
+        # Write data (csv writes None as an empty field)
+        writer.writerows(map(_ACTIVITY_VALUES, activities))
 
+    @staticmethod
     def format_positions(
-        self,
         positions: Sequence[PositionData],
+        out: TextIO,
         show_totals: bool = True,
         group_label: Optional[str] = None,
-    ) -> str:
-        """Format positions as CSV."""
+    ) -> None:
+        """Write positions as CSV."""
         if not positions:
-            return ""
+            return
 
-        output = StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(out)
 
         # Write header
-        writer.writerow(
-            [
-                "symbol",
-                "name",
-                "quantity",
-                "market_value",
-                "book_value",
-                "currency",
-                "pnl",
-                "pnl_pct",
-                "account_label",
-            ]
-        )
+        writer.writerow(_POSITION_FIELDS)
 
-        # Write data
-        for pos in positions:
-            writer.writerow(
-                [
-                    pos.symbol,
-                    pos.name,
-                    pos.quantity,
-                    pos.market_value,
-                    pos.book_value,
-                    pos.currency,
-                    pos.pnl,
-                    pos.pnl_pct,
-                    pos.account_label or "",
-                ]
-            )
+        # Write data (csv writes None as an empty field)
+        writer.writerows(map(_POSITION_VALUES, positions))
 
         # Optionally add totals row
         if show_totals and positions:
-            total_value, total_book, total_pnl, total_pnl_pct = (
+            total_value, total_book, total_pnl, total_pnl_pct, total_quantity = (
                 _calculate_position_totals(positions)
             )
             currency = positions[0].currency if positions else "CAD"
@@ -358,7 +413,7 @@ class CsvFormatter:
                 [
                     "TOTAL",
                     "",
-                    sum(p.quantity for p in positions),
+                    total_quantity,
                     total_value,
                     total_book,
                     currency,
@@ -368,7 +423,14 @@ class CsvFormatter:
                 ]
             )
 
-        return output.getvalue()
+
+# Formatters are stateless, so one shared instance of each is enough
+_FORMATTERS: dict[str, FormatterProtocol] = {
+    "table": TableFormatter(),
+    "json": JsonFormatter(),
+    "csv": CsvFormatter(),
+}
+_DEFAULT_FORMATTER = _FORMATTERS["table"]
 
 
 def get_formatter(format_type: str) -> FormatterProtocol:
@@ -380,9 +442,4 @@ def get_formatter(format_type: str) -> FormatterProtocol:
     Returns:
         Formatter instance. Defaults to TableFormatter for unknown types.
     """
-    formatters = {
-        "table": TableFormatter(),
-        "json": JsonFormatter(),
-        "csv": CsvFormatter(),
-    }
-    return formatters.get(format_type.lower(), TableFormatter())
+    return _FORMATTERS.get(format_type.lower(), _DEFAULT_FORMATTER)
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AccountData:
     """Container for formatted account data."""
 
@@ -14,7 +14,7 @@ class AccountData:
     currency: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActivityData:
     """Container for formatted activity data."""
 
@@ -27,7 +27,7 @@ class ActivityData:
     account_label: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PositionData:
     """Container for formatted position data."""
 
@@ -0,0 +1,117 @@
+"""Security market data lookups: a disk-persisted cache and concurrent prefetch."""
+
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+# Security symbol/name mappings rarely change; refresh entries once a day
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Upper bound on concurrent security lookups when prefetching
+MAX_LOOKUP_WORKERS = 16
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_entries: Optional[dict[str, dict]] = None
+_dirty = False
+
+
+def _cache_path() -> Path:
+    """Get the cache file location, honouring XDG_CACHE_HOME."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "wealthgrabber" / "securities.json"
+
+
+def _load() -> dict[str, dict]:
+    """Load cache entries from disk on first access.
+
+    Must be called with the lock held.
+    """
+    global _entries
+    if _entries is None:
+        try:
+            data = json.loads(_cache_path().read_text())
+        except (OSError, ValueError):
+            data = {}
+        _entries = data if isinstance(data, dict) else {}
+        atexit.register(save)
+    return _entries
+
+
+def get_market_data(security_id: str) -> Optional[Any]:
+    """Get cached market data for a security.
+
+    Args:
+        security_id: Security ID to look up
+
+    Returns:
+        Cached market data, or None if missing or expired
+    """
+    with _lock:
+        entry = _load().get(security_id)
+    if not entry or time.time() - entry.get("ts", 0) > CACHE_TTL_SECONDS:
+        return None
+    return entry.get("data")
+
+
+def set_market_data(security_id: str, market_data: Any) -> Any:
+    """Store market data for a security.
+
+    Args:
+        security_id: Security ID the data belongs to
+        market_data: Market data returned by the API
+
+    Returns:
+        The stored market data
+    """
+    global _dirty
+    with _lock:
+        _load()[security_id] = {"ts": time.time(), "data": market_data}
+        _dirty = True
+    return market_data
+
+
+def save() -> None:
+    """Write pending cache entries to disk. Failures are ignored."""
+    global _dirty
+    with _lock:
+        if not _dirty or _entries is None:
+            return
+        path = _cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(_entries))
+            tmp_path.replace(path)
+            _dirty = False
+        except OSError:
+            pass
+
+
+def prefetch(
+    security_ids: Iterable[str], fetch: Callable[[str], T], cache: dict[str, T]
+) -> None:
+    """Resolve all uncached securities concurrently and store them in cache.
+
+    Lookups are I/O bound, so fanning them out over a thread pool turns N
+    sequential round-trips into roughly N / MAX_LOOKUP_WORKERS.
+
+    Args:
+        security_ids: Security IDs to resolve; empty IDs are skipped
+        fetch: Function resolving a single security ID
+        cache: Per-command lookup cache to fill
+    """
+    missing = [sid for sid in set(security_ids) if sid and sid not in cache]
+    if not missing:
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_LOOKUP_WORKERS, len(missing))
+    ) as executor:
+        cache.update(zip(missing, executor.map(fetch, missing)))
@@ -0,0 +1,60 @@
+import functools
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from typer.main import get_command
+
+from wealthgrabber import security_cache
+from wealthgrabber.cli import app
+
+
+@functools.lru_cache(maxsize=1)
+def _click_app():
+    """Build the Click command tree for the Typer app once per process."""
+    return get_command(app)
+
+
+@pytest.fixture(scope="session")
+def cli():
+    """The Typer app as a Click command."""
+    return _click_app()
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """Click runner for invoking the ``cli`` command.
+
+    A fixed ``COLUMNS`` keeps Rich's help and error panels from probing the
+    real terminal, and unexpected exceptions propagate instead of being
+    wrapped in the result.
+    """
+    return CliRunner(env={"COLUMNS": "80"}, catch_exceptions=False)
+
+
+@pytest.fixture
+def patch_cli(monkeypatch):
+    """Swap a wealthgrabber attribute for a mock for the duration of a test.
+
+    The CLI imports its command modules lazily, so targets are named where
+    they are defined, e.g. ``patch_cli("auth.get_authenticated_client")``.
+    """
+
+    def _patch(target: str, value=None):
+        mock = MagicMock() if value is None else value
+        monkeypatch.setattr(f"wealthgrabber.{target}", mock)
+        return mock
+
+    return _patch
+
+
+@pytest.fixture(autouse=True)
+def isolated_security_cache(tmp_path, monkeypatch):
+    """Keep security lookups off the user's on-disk cache.
+
+    Starts every test with an empty, already-loaded cache so nothing is read
+    from or written to ``~/.cache``.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(security_cache, "_entries", {})
+    monkeypatch.setattr(security_cache, "_dirty", False)
@@ -1,130 +1,143 @@
-from unittest.mock import MagicMock
+import copy
+import io
+import json
+import re
 
 import pytest
 
-from wealthgrabber.accounts import get_accounts_data, print_accounts
+from wealthgrabber.accounts import (
+    get_accounts_data,
+    print_accounts,
+)
 from wealthgrabber.models import AccountData
 
+# Shape of an account as returned by ws.get_accounts()
+_ACCOUNT_TEMPLATE = {
+    "description": None,
+    "number": None,
+    "financials": {
+        "currentCombined": {"netLiquidationValue": {"amount": None, "currency": "CAD"}}
+    },
+}
 
-@pytest.fixture
+
+# Table output checks for test_print_accounts_output; "." stays on one line
+_HEADER_RE = re.compile(r"Account.*Number.*Value")
+_DATA_RE = re.compile(r"My TFSA.*TFSA-001.*5,000\.00")
+_TOTAL_RE = re.compile(r"Total.*5,000\.00")
+_SEP_EQ_RE = re.compile(r"^\s*={80}\s*$", re.MULTILINE)
+_SEP_DASH_RE = re.compile(r"^\s*-{80}\s*$", re.MULTILINE)
+
+
+def _make_account(description: str, number: str, amount: str) -> dict:
+    """Build an API account payload from the shared template."""
+    account = copy.deepcopy(_ACCOUNT_TEMPLATE)
+    account["description"] = description
+    account["number"] = number
+    account["financials"]["currentCombined"]["netLiquidationValue"]["amount"] = amount
+    return account
+
+
+class _StubWS:
+    """Minimal WealthsimpleAPI stand-in exposing only get_accounts()."""
+
+    __slots__ = ("get_accounts_return",)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.get_accounts_return = []
+
+    def get_accounts(self):
+        return self.get_accounts_return
+
+
+@pytest.fixture(scope="module")
 def mock_ws_client():
-    return MagicMock()
+    return _StubWS()
+
+
+@pytest.fixture(autouse=True)
+def reset_ws_client(mock_ws_client):
+    """Give each test a clean shared client."""
+    mock_ws_client.reset()
+
+
+@pytest.fixture
+def ws_with_accounts(mock_ws_client):
+    """Factory wiring the shared client to return the given accounts."""
+
+    def _factory(accounts: list[dict]) -> _StubWS:
+        mock_ws_client.get_accounts_return = accounts
+        return mock_ws_client
+
+    return _factory
 
 
-def test_get_accounts_data_empty(mock_ws_client):
+def test_get_accounts_data_empty(ws_with_accounts):
     """Test get_accounts_data with no accounts."""
-    mock_ws_client.get_accounts.return_value = []
-    result = get_accounts_data(mock_ws_client)
+    client = ws_with_accounts([])
+    result = get_accounts_data(client)
     assert result == []
 
 
-def test_get_accounts_data_valid(mock_ws_client):
-    """Test get_accounts_data with valid accounts."""
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "Test Account",
-            "number": "123456",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "1000.50", "currency": "CAD"}
-                }
-            },
-        }
-    ]
-    result = get_accounts_data(mock_ws_client)
-    assert len(result) == 1
-    assert isinstance(result[0], AccountData)
-    assert result[0].description == "Test Account"
-    assert result[0].number == "123456"
-    assert result[0].value == 1000.50
-
-
-def test_print_accounts_output(mock_ws_client, capsys):
+# Single-account scenarios: (description, number, amount, kwargs, expected count)
+_SINGLE_ACCOUNT_CASES = [
+    ("Test Account", "123456", "1000.50", {}, 1),
+    ("Zero Balance Account", "ZERO-001", "0.00", {}, 0),
+    ("Zero Balance Account", "ZERO-001", "0.00", {"show_zero_balances": True}, 1),
+]
+
+
+@pytest.mark.parametrize(
+    "description,number,amount,kwargs,expected_count",
+    _SINGLE_ACCOUNT_CASES,
+    ids=["valid", "zero-balance-hidden", "zero-balance-shown"],
+)
+def test_get_accounts_data_scenarios(
+    ws_with_accounts, description, number, amount, kwargs, expected_count
+):
+    """Test conversion and zero-balance filtering of a single account."""
+    client = ws_with_accounts([_make_account(description, number, amount)])
+
+    result = get_accounts_data(client, **kwargs)
+
+    assert len(result) == expected_count
+    if expected_count:
+        assert isinstance(result[0], AccountData)
+        assert result[0].description == description
+        assert result[0].number == number
+        assert result[0].value == float(amount)
+
+
+def test_print_accounts_output(ws_with_accounts, capsys):
     """Test print_accounts output generation."""
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "My TFSA",
-            "number": "TFSA-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "5000.00", "currency": "CAD"}
-                }
-            },
-        }
-    ]
-
-    print_accounts(mock_ws_client)
-
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
-
-    # Validate table structure: header row
-    assert any(
-        "Account" in line and "Number" in line and "Value" in line for line in lines
-    )
-
-    # Validate separator lines
-    assert any(line.strip() == "=" * 80 for line in lines)
-    assert any(line.strip() == "-" * 80 for line in lines)
-
-    # Find data row (contains all expected values)
-    data_row = None
-    for line in lines:
-        if "My TFSA" in line and "TFSA-001" in line and "5,000.00" in line:
-            data_row = line
-            break
-
-    assert data_row is not None, "Expected data row with account info not found"
-
-    # Validate total row
-    assert any("Total" in line and "5,000.00" in line for line in lines)
-
-
-def test_get_accounts_data_zero_balance_filtering(mock_ws_client):
-    """Test that zero balance accounts are filtered by default."""
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "Zero Balance Account",
-            "number": "ZERO-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "0.00", "currency": "CAD"}
-                }
-            },
-        }
-    ]
-
-    # Default behavior: filter out zero balance
-    result = get_accounts_data(mock_ws_client)
-    assert len(result) == 0
-
-    # Explicit behavior: show zero balance
-    result = get_accounts_data(mock_ws_client, show_zero_balances=True)
-    assert len(result) == 1
-    assert result[0].description == "Zero Balance Account"
-
-
-def test_print_accounts_json_format(mock_ws_client, capsys):
+    client = ws_with_accounts([_make_account("My TFSA", "TFSA-001", "5000.00")])
+
+    print_accounts(client)
+
+    out = capsys.readouterr().out
+
+    # Validate table structure: header row and separator lines
+    assert _HEADER_RE.search(out)
+    assert _SEP_EQ_RE.search(out)
+    assert _SEP_DASH_RE.search(out)
+
+    # Data row (contains all expected values) and total row
+    assert _DATA_RE.search(out), "Expected data row with account info not found"
+    assert _TOTAL_RE.search(out)
+
+
+def test_print_accounts_json_format(ws_with_accounts):
     """Test print_accounts with JSON format."""
-    import json
-
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "My Account",
-            "number": "ACC-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "1000.00", "currency": "CAD"}
-                }
-            },
-        }
-    ]
-
-    print_accounts(mock_ws_client, output_format="json")
-    captured = capsys.readouterr()
+    client = ws_with_accounts([_make_account("My Account", "ACC-001", "1000.00")])
+
+    out = io.StringIO()
+    print_accounts(client, output_format="json", out=out)
 
     # Parse JSON and validate structure
-    data = json.loads(captured.out)
+    data = json.loads(out.getvalue())
     assert isinstance(data, list)
     assert len(data) == 1
     assert data[0]["description"] == "My Account"
@@ -133,208 +146,101 @@ def test_print_accounts_json_format(mock_ws_client, capsys):
     assert data[0]["currency"] == "CAD"
 
 
-def _get_account_descriptions(accounts) -> set[str]:
+def _get_account_descriptions(accounts) -> frozenset[str]:
     """Extract descriptions from account list."""
-    return {acc.description for acc in accounts}
-
-
-def test_get_accounts_data_liquid_only_filtering(mock_ws_client):
-    """Test that non-liquid accounts are filtered when liquid_only is True."""
-    accounts_data = [
-        ("My TFSA", "TFSA-001", "5000.00"),
-        ("My RRSP Account", "RRSP-001", "10000.00"),
-        ("LIRA Fund", "LIRA-001", "8000.00"),
-        ("Private Equity Investment", "PE-001", "15000.00"),
-        ("Private Credit Fund", "PC-001", "12000.00"),
-        ("Margin Account", "MAR-001", "20000.00"),
-    ]
-
-    def create_account(description, number, amount):
-        return {
-            "description": description,
-            "number": number,
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": amount, "currency": "CAD"}
-                }
-            },
-        }
-
-    mock_ws_client.get_accounts.return_value = [
-        create_account(desc, num, amt) for desc, num, amt in accounts_data
-    ]
-
-    # Default behavior: show all accounts
-    result = get_accounts_data(mock_ws_client, show_zero_balances=True)
-    descriptions = _get_account_descriptions(result)
-    assert len(result) == 6
-    assert descriptions == {desc for desc, _, _ in accounts_data}
-
-    # Liquid-only behavior: filter out RRSP, LIRA, Private Equity, Private Credit
-    result = get_accounts_data(
-        mock_ws_client, show_zero_balances=True, liquid_only=True
-    )
-    descriptions = _get_account_descriptions(result)
-    assert len(result) == 2
-    assert descriptions == {"My TFSA", "Margin Account"}
-
-    # Verify non-liquid accounts are excluded
-    non_liquid = {
+    return frozenset(acc.description for acc in accounts)
+
+
+# Accounts covering every liquidity keyword plus two liquid accounts
+_MIXED_ACCOUNTS = [
+    ("My TFSA", "TFSA-001", "5000.00"),
+    ("My RRSP Account", "RRSP-001", "10000.00"),
+    ("LIRA Fund", "LIRA-001", "8000.00"),
+    ("Private Equity Investment", "PE-001", "15000.00"),
+    ("Private Credit Fund", "PC-001", "12000.00"),
+    ("Margin Account", "MAR-001", "20000.00"),
+]
+_NON_LIQUID = frozenset(
+    {
         "My RRSP Account",
         "LIRA Fund",
         "Private Equity Investment",
         "Private Credit Fund",
     }
-    assert not descriptions.intersection(non_liquid)
-
-
-def test_get_accounts_data_liquid_only_case_insensitive(mock_ws_client):
-    """Test that liquid_only filtering is case-insensitive."""
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "my rrsp account",
-            "number": "RRSP-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "10000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "LIRA fund",
-            "number": "LIRA-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "8000.00", "currency": "CAD"}
-                }
-            },
-        },
-    ]
-
-    # These should be filtered out even with different casing
-    result = get_accounts_data(
-        mock_ws_client, show_zero_balances=True, liquid_only=True
-    )
-    assert len(result) == 0
-
-
-def test_get_accounts_data_filter_combinations(mock_ws_client):
-    """Test combinations of filters work correctly together."""
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "My TFSA",
-            "number": "TFSA-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "5000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "My RRSP Account",
-            "number": "RRSP-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "0.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "Margin Account",
-            "number": "MAR-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "20000.00", "currency": "CAD"}
-                }
-            },
-        },
-    ]
-
-    # Test: liquid_only=True + show_zero_balances=False
-    result = get_accounts_data(
-        mock_ws_client, liquid_only=True, show_zero_balances=False
-    )
-    descriptions = {acc.description for acc in result}
-    expected = {
-        "My TFSA",
-        "Margin Account",
-    }  # TFSA and Margin (not RRSP with zero balance)
-    assert descriptions == expected
-
-    # Test: not_liquid=True + show_zero_balances=True
-    result = get_accounts_data(mock_ws_client, not_liquid=True, show_zero_balances=True)
-    descriptions = {acc.description for acc in result}
-    expected = {"My RRSP Account"}  # Only RRSP (non-liquid, zero balance included)
-    assert descriptions == expected
-
-
-def test_get_accounts_data_not_liquid_filtering(mock_ws_client):
-    """Test that liquid accounts are filtered when not_liquid is True."""
-    mock_ws_client.get_accounts.return_value = [
-        {
-            "description": "My TFSA",
-            "number": "TFSA-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "5000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "My RRSP Account",
-            "number": "RRSP-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "10000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "LIRA Fund",
-            "number": "LIRA-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "8000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "Private Equity Investment",
-            "number": "PE-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "15000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "Private Credit Fund",
-            "number": "PC-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "12000.00", "currency": "CAD"}
-                }
-            },
-        },
-        {
-            "description": "Margin Account",
-            "number": "MAR-001",
-            "financials": {
-                "currentCombined": {
-                    "netLiquidationValue": {"amount": "20000.00", "currency": "CAD"}
-                }
-            },
-        },
-    ]
-
-    # not_liquid=True: show only non-liquid accounts
-    result = get_accounts_data(mock_ws_client, show_zero_balances=True, not_liquid=True)
-    assert len(result) == 4
-    descriptions = {acc.description for acc in result}
-    expected = {
-        "My RRSP Account",
-        "LIRA Fund",
-        "Private Equity Investment",
-        "Private Credit Fund",
+)
+_ALL_MIXED = frozenset(desc for desc, _, _ in _MIXED_ACCOUNTS)
+_LIQUID = frozenset({"My TFSA", "Margin Account"})
+# RRSP with a zero balance, between two funded liquid accounts
+_ZERO_RRSP_ACCOUNTS = [
+    ("My TFSA", "TFSA-001", "5000.00"),
+    ("My RRSP Account", "RRSP-001", "0.00"),
+    ("Margin Account", "MAR-001", "20000.00"),
+]
+# Non-liquid accounts with lowercase/mixed-case keywords
+_LOWERCASE_ACCOUNTS = [
+    ("my rrsp account", "RRSP-001", "10000.00"),
+    ("LIRA fund", "LIRA-001", "8000.00"),
+]
+
+
+@pytest.fixture(scope="module")
+def liquid_test_accounts():
+    """Account payloads for the liquidity filter cases, built once per module."""
+    return {
+        "mixed": [_make_account(*a) for a in _MIXED_ACCOUNTS],
+        "zero_rrsp": [_make_account(*a) for a in _ZERO_RRSP_ACCOUNTS],
+        "lowercase": [_make_account(*a) for a in _LOWERCASE_ACCOUNTS],
     }
-    assert descriptions == expected
+
+
+@pytest.mark.parametrize(
+    "account_set,kwargs,expected",
+    [
+        pytest.param(
+            "mixed",
+            {"show_zero_balances": True},
+            _ALL_MIXED,
+            id="no-liquidity-filter",
+        ),
+        pytest.param(
+            "mixed",
+            {"show_zero_balances": True, "liquid_only": True},
+            _LIQUID,
+            id="liquid-only",
+        ),
+        pytest.param(
+            "lowercase",
+            {"show_zero_balances": True, "liquid_only": True},
+            frozenset(),
+            id="liquid-only-case-insensitive",
+        ),
+        pytest.param(
+            "mixed",
+            {"show_zero_balances": True, "not_liquid": True},
+            _NON_LIQUID,
+            id="not-liquid",
+        ),
+        pytest.param(
+            "zero_rrsp",
+            {"show_zero_balances": False, "liquid_only": True},
+            _LIQUID,
+            id="liquid-only-hide-zero",
+        ),
+        pytest.param(
+            "zero_rrsp",
+            {"show_zero_balances": True, "not_liquid": True},
+            frozenset({"My RRSP Account"}),
+            id="not-liquid-show-zero",
+        ),
+    ],
+)
+def test_get_accounts_data_liquidity_filtering(
+    ws_with_accounts, liquid_test_accounts, account_set, kwargs, expected
+):
+    """Test liquid_only/not_liquid filtering, alone and with zero-balance filtering."""
+    client = ws_with_accounts(liquid_test_accounts[account_set])
+
+    result = get_accounts_data(client, **kwargs)
+
+    assert len(result) == len(expected)
+    assert _get_account_descriptions(result) == expected
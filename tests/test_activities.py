@@ -1,8 +1,13 @@
-from unittest.mock import MagicMock
+import re
+from types import MappingProxyType
+from unittest.mock import create_autospec
 
 import pytest
+from ws_api import WealthsimpleAPI
 
+from wealthgrabber import security_cache
 from wealthgrabber.activities import (
+    MIN_FETCH_SIZE,
     _enhance_description,
     _format_date,
     _get_security_name,
@@ -13,15 +18,48 @@ from wealthgrabber.activities import (
 )
 from wealthgrabber.models import ActivityData
 
+# Table output checks for print_activities tests; "." stays on one line
+_HEADER_RE = re.compile(r"Date.*Type.*Description.*Amount")
+_ACCOUNT_HEADER_RE = re.compile(r"Account:.*My TFSA.*TFSA-001")
+_BUY_ROW_RE = re.compile(r"2024-01-15.*DIY_BUY")
+_DIVIDEND_ROW_RE = re.compile(r"2024-01-10.*DIY_DIVIDEND")
+
+# Separator lines, newline-delimited so a substring check matches whole lines
+_SEP_EQ = "\n" + "=" * 80 + "\n"
+_SEP_DASH = "\n" + "-" * 80 + "\n"
+
+# Accounts as returned by ws.get_accounts(); slice for a single account
+_BASE_ACCOUNTS = [
+    {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"},
+    {"number": "RRSP-001", "id": "acc-456", "description": "My RRSP"},
+]
+
+# Activity with short fields; truncation tests override one of them
+_TRUNCATION_ACTIVITY = {
+    "type": "BUY",
+    "occurredAt": "2024-01-15T10:30:00Z",
+    "amount": "100.00",
+    "amountSign": "positive",
+    "currency": "CAD",
+    "description": "Test",
+}
+
+# More activities than test_print_activities_respects_limit asks for
+_LIMIT_ACTIVITIES = tuple(
+    {
+        "type": "DIY_BUY",
+        "description": f"Activity {i}",
+        "occurredAt": "2024-01-15T10:30:00Z",
+        "amountSign": "negative",
+        "amount": "100.00",
+        "currency": "CAD",
+    }
+    for i in range(10)
+)
 
-@pytest.fixture
-def mock_ws_client():
-    return MagicMock()
-
-
-@pytest.fixture
-def sample_activity():
-    return {
+# Read-only activity payloads as returned by ws.get_activities()
+_SAMPLE_ACTIVITY = MappingProxyType(
+    {
         "type": "DIY_BUY",
         "subType": "BUY",
         "description": "Bought 10 XEQT @ $25.50",
@@ -31,11 +69,9 @@ def sample_activity():
         "amount": "255.00",
         "currency": "CAD",
     }
-
-
-@pytest.fixture
-def sample_dividend_activity():
-    return {
+)
+_SAMPLE_DIVIDEND_ACTIVITY = MappingProxyType(
+    {
         "type": "DIY_DIVIDEND",
         "subType": "DIVIDEND",
         "description": "XEQT Dividend",
@@ -45,47 +81,77 @@ def sample_dividend_activity():
         "amount": "12.34",
         "currency": "CAD",
     }
+)
 
 
-# Tests for is_dividend_activity
-def test_is_dividend_activity_true_by_type(sample_dividend_activity):
-    """Test dividend detection for dividend activity type."""
-    assert is_dividend_activity(sample_dividend_activity) is True
+@pytest.fixture(scope="module")
+def _spec_ws_client():
+    return create_autospec(WealthsimpleAPI, instance=True)
 
 
-def test_is_dividend_activity_true_by_description():
-    """Test dividend detection when dividend is in description."""
-    activity = {
-        "type": "SOME_TYPE",
-        "description": "Monthly Dividend Payment",
-    }
-    assert is_dividend_activity(activity) is True
+@pytest.fixture
+def mock_ws_client(_spec_ws_client):
+    """Shared API-specced client, reset after each test."""
+    yield _spec_ws_client
+    _spec_ws_client.reset_mock(return_value=True, side_effect=True)
 
 
-def test_is_dividend_activity_distribution():
-    """Test dividend detection for distribution type."""
-    activity = {
-        "type": "DISTRIBUTION",
-        "description": "ETF Distribution",
-    }
-    assert is_dividend_activity(activity) is True
+@pytest.fixture(scope="module")
+def sample_activity():
+    return _SAMPLE_ACTIVITY
 
 
-def test_is_dividend_activity_false(sample_activity):
-    """Test dividend detection for non-dividend activity."""
-    assert is_dividend_activity(sample_activity) is False
+@pytest.fixture(scope="module")
+def sample_dividend_activity():
+    return _SAMPLE_DIVIDEND_ACTIVITY
 
 
-def test_is_dividend_activity_lowercase():
-    """Test dividend detection with lowercase description."""
-    activity = {"type": "some_type", "description": "monthly dividend payment"}
-    assert is_dividend_activity(activity) is True
+def _wire(mock, accounts, activities):
+    """Configure the client to return the given accounts and activities."""
+    mock.get_accounts.return_value = accounts
+    mock.get_activities.return_value = activities
+    mock.get_security_market_data.return_value = None
 
 
-def test_is_dividend_activity_mixed_case():
-    """Test dividend detection with mixed case."""
-    activity = {"type": "SOME_TYPE", "description": "Monthly DiViDeNd Payment"}
-    assert is_dividend_activity(activity) is True
+# Tests for is_dividend_activity
+@pytest.mark.parametrize(
+    "activity,expected",
+    [
+        pytest.param(
+            {"type": "DIY_DIVIDEND", "description": "XEQT Dividend"},
+            True,
+            id="dividend_type",
+        ),
+        pytest.param(
+            {"type": "SOME_TYPE", "description": "Monthly Dividend Payment"},
+            True,
+            id="dividend_in_description",
+        ),
+        pytest.param(
+            {"type": "DISTRIBUTION", "description": "ETF Distribution"},
+            True,
+            id="distribution",
+        ),
+        pytest.param(
+            {"type": "DIY_BUY", "description": "Bought 10 XEQT @ $25.50"},
+            False,
+            id="non_dividend",
+        ),
+        pytest.param(
+            {"type": "some_type", "description": "monthly dividend payment"},
+            True,
+            id="lowercase",
+        ),
+        pytest.param(
+            {"type": "SOME_TYPE", "description": "Monthly DiViDeNd Payment"},
+            True,
+            id="mixed_case",
+        ),
+    ],
+)
+def test_is_dividend_activity(activity, expected):
+    """Test dividend detection by type and description, case-insensitively."""
+    assert is_dividend_activity(activity) is expected
 
 
 # Tests for get_account_id_by_number
@@ -101,13 +167,21 @@ def test_get_account_id_by_number_found(mock_ws_client):
 
 def test_get_account_id_by_number_not_found(mock_ws_client):
     """Test behavior when account number not found."""
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}
-    ]
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
     result = get_account_id_by_number(mock_ws_client, "RRSP-999")
     assert result is None
 
 
+def test_get_account_id_by_number_duplicate_returns_first(mock_ws_client):
+    """Test the first account wins when several share a number."""
+    mock_ws_client.get_accounts.return_value = [
+        {"number": "TFSA-001", "id": "acc-first"},
+        {"number": "TFSA-001", "id": "acc-second"},
+    ]
+    result = get_account_id_by_number(mock_ws_client, "TFSA-001")
+    assert result == "acc-first"
+
+
 def test_get_account_id_by_number_empty_accounts(mock_ws_client):
     """Test behavior when no accounts exist."""
     mock_ws_client.get_accounts.return_value = []
@@ -116,57 +190,51 @@ def test_get_account_id_by_number_empty_accounts(mock_ws_client):
 
 
 # Tests for _format_date
-def test_format_date_valid_iso():
-    """Test formatting valid ISO date."""
-    result = _format_date("2024-01-15T10:30:00Z")
-    assert result == "2024-01-15"
-
-
-def test_format_date_with_timezone():
-    """Test formatting ISO date with timezone offset."""
-    result = _format_date("2024-01-15T10:30:00+00:00")
-    assert result == "2024-01-15"
-
-
-def test_format_date_invalid():
-    """Test formatting invalid date string."""
-    result = _format_date("invalid")
-    assert result == "N/A"
-
-
-def test_format_date_empty():
-    """Test formatting empty string."""
-    result = _format_date("")
-    assert result == "N/A"
-
-
-def test_format_date_various_timezones():
-    """Test formatting dates with various timezone offsets."""
-    assert _format_date("2024-01-15T10:30:00+05:30") == "2024-01-15"
-    assert _format_date("2024-01-15T10:30:00-08:00") == "2024-01-15"
-
-
-def test_format_date_with_milliseconds():
-    """Test formatting date with milliseconds."""
-    assert _format_date("2024-01-15T10:30:00.123Z") == "2024-01-15"
-
-
-def test_format_date_partial_date():
-    """Test formatting partial date string."""
-    result = _format_date("2024-01-15")
-    assert result == "2024-01-15"
+@pytest.mark.parametrize(
+    "iso_date,expected",
+    [
+        pytest.param("2024-01-15T10:30:00Z", "2024-01-15", id="valid_iso"),
+        pytest.param("2024-01-15T10:30:00+00:00", "2024-01-15", id="with_timezone"),
+        pytest.param("2024-01-15T10:30:00+05:30", "2024-01-15", id="positive_offset"),
+        pytest.param("2024-01-15T10:30:00-08:00", "2024-01-15", id="negative_offset"),
+        pytest.param("20240115T103000Z", "2024-01-15", id="basic_format"),
+        pytest.param("2024-01-15T10:30:00.123Z", "2024-01-15", id="with_milliseconds"),
+        pytest.param("2024-01-15", "2024-01-15", id="partial_date"),
+        pytest.param("invalid", "N/A", id="invalid"),
+        pytest.param("", "N/A", id="empty"),
+    ],
+)
+def test_format_date(iso_date, expected):
+    """Test formatting ISO dates, falling back to N/A when unparseable."""
+    assert _format_date(iso_date) == expected
 
 
 # Tests for _get_security_name
-def test_get_security_name_from_api(mock_ws_client):
-    """Test fetching security name from API."""
-    mock_ws_client.get_security_market_data.return_value = {
-        "stock": {"symbol": "XEQT", "name": "iShares Equity ETF Portfolio"}
-    }
+@pytest.mark.parametrize(
+    "response,expected",
+    [
+        pytest.param(
+            {"stock": {"symbol": "XEQT", "name": "iShares Equity ETF Portfolio"}},
+            "XEQT",
+            id="from_api",
+        ),
+        pytest.param(
+            {"stock": {"symbol": "", "name": "iShares Equity ETF Portfolio"}},
+            "iShares Equity ETF Portfolio",
+            id="fallback_to_name",
+        ),
+        pytest.param(Exception("API Error"), "sec-s-123abc", id="api_error"),
+        pytest.param({}, "sec-s-123abc", id="missing_stock_data"),
+    ],
+)
+def test_get_security_name_lookup(mock_ws_client, response, expected):
+    """Test resolving a security via the API, falling back to its ID."""
+    # An exception in a side_effect iterable is raised instead of returned
+    mock_ws_client.get_security_market_data.side_effect = [response]
     cache = {}
     result = _get_security_name(mock_ws_client, "sec-s-123abc", cache)
-    assert result == "XEQT"
-    assert "sec-s-123abc" in cache
+    assert result == expected
+    assert cache == {"sec-s-123abc": expected}
 
 
 def test_get_security_name_cached(mock_ws_client):
@@ -177,30 +245,22 @@ def test_get_security_name_cached(mock_ws_client):
     mock_ws_client.get_security_market_data.assert_not_called()
 
 
-def test_get_security_name_fallback_to_name(mock_ws_client):
-    """Test fallback to name when symbol is not available."""
-    mock_ws_client.get_security_market_data.return_value = {
-        "stock": {"symbol": "", "name": "iShares Equity ETF Portfolio"}
-    }
-    cache = {}
-    result = _get_security_name(mock_ws_client, "sec-s-456def", cache)
-    assert result == "iShares Equity ETF Portfolio"
-
-
-def test_get_security_name_api_error(mock_ws_client):
-    """Test fallback to security ID on API error."""
-    mock_ws_client.get_security_market_data.side_effect = Exception("API Error")
-    cache = {}
-    result = _get_security_name(mock_ws_client, "sec-s-789ghi", cache)
-    assert result == "sec-s-789ghi"
+def test_get_security_name_uses_disk_cache(mock_ws_client):
+    """Test market data cached on disk is used without an API call."""
+    security_cache.set_market_data("sec-s-123abc", {"stock": {"symbol": "XEQT"}})
+    assert _get_security_name(mock_ws_client, "sec-s-123abc", {}) == "XEQT"
+    mock_ws_client.get_security_market_data.assert_not_called()
 
 
-def test_get_security_name_missing_stock_data(mock_ws_client):
-    """Test fallback when response lacks stock data."""
-    mock_ws_client.get_security_market_data.return_value = {}
-    cache = {}
-    result = _get_security_name(mock_ws_client, "sec-s-000jkl", cache)
-    assert result == "sec-s-000jkl"
+def test_get_security_name_stores_in_disk_cache(mock_ws_client):
+    """Test looked-up market data is written to the disk cache."""
+    data = {"stock": {"symbol": "XEQT", "name": "iShares Equity ETF Portfolio"}}
+    mock_ws_client.get_security_market_data.return_value = data
+    _get_security_name(mock_ws_client, "sec-s-123abc", {})
+    mock_ws_client.get_security_market_data.assert_called_once_with(
+        "sec-s-123abc", use_cache=False
+    )
+    assert security_cache.get_market_data("sec-s-123abc") == data
 
 
 # Tests for _enhance_description
@@ -292,95 +352,117 @@ def test_enhance_description_diy_buy_security_already_in_name(mock_ws_client):
 
 
 # Tests for get_activities_data
-def test_get_activities_data_single_account(mock_ws_client, sample_activity):
-    """Test get_activities_data for a single account."""
-    mock_ws_client.get_activities.return_value = [sample_activity]
-    mock_ws_client.get_security_market_data.return_value = None
+@pytest.mark.parametrize(
+    "accounts,activities,account_id,dividends_only,expected",
+    [
+        pytest.param(
+            [],
+            [_SAMPLE_ACTIVITY],
+            "acc-123",
+            False,
+            [("DIY_BUY", None)],
+            id="single_account",
+        ),
+        pytest.param(
+            _BASE_ACCOUNTS,
+            [_SAMPLE_ACTIVITY],
+            None,
+            False,
+            # One activity per account
+            [("DIY_BUY", "My TFSA (TFSA-001)"), ("DIY_BUY", "My RRSP (RRSP-001)")],
+            id="multiple_accounts",
+        ),
+        pytest.param(
+            [],
+            [_SAMPLE_ACTIVITY, _SAMPLE_DIVIDEND_ACTIVITY],
+            "acc-123",
+            True,
+            [("DIY_DIVIDEND", None)],
+            id="dividends_only",
+        ),
+    ],
+)
+def test_get_activities_data_matrix(
+    mock_ws_client, accounts, activities, account_id, dividends_only, expected
+):
+    """Test get_activities_data across account and dividend filter variants."""
+    _wire(mock_ws_client, accounts, activities)
+
+    result = get_activities_data(
+        mock_ws_client, account_id=account_id, dividends_only=dividends_only
+    )
+
+    assert [(act.activity_type, act.account_label) for act in result] == expected
+
+
+def test_get_activities_data_fields(mock_ws_client, sample_activity):
+    """Test that API activity fields map onto ActivityData."""
+    _wire(mock_ws_client, [], [sample_activity])
 
     result = get_activities_data(mock_ws_client, account_id="acc-123")
 
     assert len(result) == 1
     assert isinstance(result[0], ActivityData)
-    assert result[0].activity_type == "DIY_BUY"
-    assert result[0].account_label is None
     assert result[0].date == "2024-01-15"
     assert result[0].amount == 255.00
     assert result[0].sign == "-"  # because amountSign="negative"
     assert result[0].currency == "CAD"
 
 
-def test_get_activities_data_multiple_accounts(mock_ws_client, sample_activity):
-    """Test get_activities_data for multiple accounts."""
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"},
-        {"number": "RRSP-001", "id": "acc-456", "description": "My RRSP"},
-    ]
+# Tests for print_activities
+def test_print_activities_all_accounts(mock_ws_client, sample_activity, capsys):
+    """Test printing activities for all accounts."""
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
     mock_ws_client.get_activities.return_value = [sample_activity]
     mock_ws_client.get_security_market_data.return_value = None
 
-    result = get_activities_data(mock_ws_client)
+    print_activities(mock_ws_client)
 
-    assert len(result) == 2  # One activity per account
-    assert result[0].account_label == "My TFSA (TFSA-001)"
-    assert result[1].account_label == "My RRSP (RRSP-001)"
+    out = capsys.readouterr().out
 
+    # Validate table structure: header row and separator lines
+    assert _HEADER_RE.search(out)
+    assert _SEP_EQ in out
+    assert _SEP_DASH in out
 
-def test_get_activities_data_dividends_only(
-    mock_ws_client, sample_activity, sample_dividend_activity
-):
-    """Test get_activities_data with dividends_only filter."""
-    mock_ws_client.get_activities.return_value = [
-        sample_activity,
-        sample_dividend_activity,
-    ]
-    mock_ws_client.get_security_market_data.return_value = None
+    # Validate account header
+    assert _ACCOUNT_HEADER_RE.search(out)
 
-    result = get_activities_data(
-        mock_ws_client, account_id="acc-123", dividends_only=True
-    )
+    assert _BUY_ROW_RE.search(out), "Expected data row with activity info not found"
 
-    assert len(result) == 1
-    assert result[0].activity_type == "DIY_DIVIDEND"
 
-
-# Tests for print_activities
-def test_print_activities_all_accounts(mock_ws_client, sample_activity, capsys):
-    """Test printing activities for all accounts."""
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}
-    ]
+def test_get_activities_data_requests_limit(mock_ws_client, sample_activity):
+    """Test that the limit is passed to the API unless filtering dividends."""
     mock_ws_client.get_activities.return_value = [sample_activity]
     mock_ws_client.get_security_market_data.return_value = None
 
-    print_activities(mock_ws_client)
+    get_activities_data(mock_ws_client, account_id="acc-123", limit=5)
+    mock_ws_client.get_activities.assert_called_with("acc-123", how_many=MIN_FETCH_SIZE)
 
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
+    get_activities_data(mock_ws_client, account_id="acc-123", limit=80)
+    mock_ws_client.get_activities.assert_called_with("acc-123", how_many=80)
 
-    # Validate table structure: header row
-    assert any(
-        "Date" in line and "Type" in line and "Description" in line and "Amount" in line
-        for line in lines
+    get_activities_data(
+        mock_ws_client, account_id="acc-123", dividends_only=True, limit=5
     )
+    mock_ws_client.get_activities.assert_called_with("acc-123")
 
-    # Validate separator lines
-    assert any(line.strip() == "=" * 80 for line in lines)
-    assert any(line.strip() == "-" * 80 for line in lines)
 
-    # Validate account header
-    assert any(
-        "Account:" in line and "My TFSA" in line and "TFSA-001" in line
-        for line in lines
-    )
+def test_get_activities_data_limit_survives_dropped_items(
+    mock_ws_client, sample_activity
+):
+    """Test the limit is still filled when the API drops some activities."""
+
+    def get_activities(account_id, how_many=50):
+        # Mimic ws_api discarding rejected activities from the fetched page
+        return [sample_activity for i in range(how_many) if i % 2]
 
-    # Find data row with activity info
-    data_row = None
-    for line in lines:
-        if "DIY_BUY" in line and "2024-01-15" in line:
-            data_row = line
-            break
+    mock_ws_client.get_activities.side_effect = get_activities
+    mock_ws_client.get_security_market_data.return_value = None
+
+    result = get_activities_data(mock_ws_client, account_id="acc-123", limit=5)
 
-    assert data_row is not None, "Expected data row with activity info not found"
+    assert len(result) == 5
 
 
 def test_print_activities_single_account(mock_ws_client, sample_activity, capsys):
@@ -390,28 +472,15 @@ def test_print_activities_single_account(mock_ws_client, sample_activity, capsys
 
     print_activities(mock_ws_client, account_id="acc-123")
 
-    mock_ws_client.get_activities.assert_called_with("acc-123")
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
-
-    # Validate table structure: header row
-    assert any(
-        "Date" in line and "Type" in line and "Description" in line and "Amount" in line
-        for line in lines
-    )
-
-    # Validate separator lines
-    assert any(line.strip() == "=" * 80 for line in lines)
-    assert any(line.strip() == "-" * 80 for line in lines)
+    mock_ws_client.get_activities.assert_called_with("acc-123", how_many=50)
+    out = capsys.readouterr().out
 
-    # Find data row with activity
-    data_row = None
-    for line in lines:
-        if "DIY_BUY" in line and "2024-01-15" in line:
-            data_row = line
-            break
+    # Validate table structure: header row and separator lines
+    assert _HEADER_RE.search(out)
+    assert _SEP_EQ in out
+    assert _SEP_DASH in out
 
-    assert data_row is not None, "Expected data row with activity not found"
+    assert _BUY_ROW_RE.search(out), "Expected data row with activity not found"
 
 
 def test_print_activities_no_accounts(mock_ws_client, capsys):
@@ -427,9 +496,7 @@ def test_print_activities_no_accounts(mock_ws_client, capsys):
 
 def test_print_activities_no_activities(mock_ws_client, capsys):
     """Test printing when account has no activities."""
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}
-    ]
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
     mock_ws_client.get_activities.return_value = []
 
     print_activities(mock_ws_client)
@@ -442,9 +509,7 @@ def test_print_activities_dividends_only(
     mock_ws_client, sample_activity, sample_dividend_activity, capsys
 ):
     """Test dividend filtering."""
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}
-    ]
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
     mock_ws_client.get_activities.return_value = [
         sample_activity,
         sample_dividend_activity,
@@ -453,39 +518,20 @@ def test_print_activities_dividends_only(
 
     print_activities(mock_ws_client, dividends_only=True)
 
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
+    out = capsys.readouterr().out
 
     # Validate table structure: header row
-    assert any(
-        "Date" in line and "Type" in line and "Description" in line and "Amount" in line
-        for line in lines
-    )
+    assert _HEADER_RE.search(out)
 
     # Validate that only dividend activity is present
-    assert any("DIY_DIVIDEND" in line and "2024-01-10" in line for line in lines)
-
-    # Validate that buy activity is NOT present
-    assert not any("DIY_BUY" in line and "2024-01-15" in line for line in lines)
+    assert _DIVIDEND_ROW_RE.search(out)
+    assert not _BUY_ROW_RE.search(out)
 
 
 def test_print_activities_respects_limit(mock_ws_client, capsys):
     """Test that limit parameter is respected."""
-    activities = [
-        {
-            "type": "DIY_BUY",
-            "description": f"Activity {i}",
-            "occurredAt": "2024-01-15T10:30:00Z",
-            "amountSign": "negative",
-            "amount": "100.00",
-            "currency": "CAD",
-        }
-        for i in range(10)
-    ]
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}
-    ]
-    mock_ws_client.get_activities.return_value = activities
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
+    mock_ws_client.get_activities.return_value = _LIMIT_ACTIVITIES
     mock_ws_client.get_security_market_data.return_value = None
 
     print_activities(mock_ws_client, limit=3)
@@ -495,50 +541,35 @@ def test_print_activities_respects_limit(mock_ws_client, capsys):
     assert captured.out.count("DIY_BUY") == 3
 
 
-def test_get_activities_data_truncates_long_type(mock_ws_client):
-    """Test that activity types longer than 14 characters are truncated."""
-    activity = {
-        "type": "VERY_LONG_TYPE_NAME_THAT_EXCEEDS_14_CHARS",
-        "occurredAt": "2024-01-15T10:30:00Z",
-        "amount": "100.00",
-        "amountSign": "positive",
-        "currency": "CAD",
-        "description": "Test",
-    }
-    mock_ws_client.get_activities.return_value = [activity]
-    mock_ws_client.get_security_market_data.return_value = None
-
-    result = get_activities_data(mock_ws_client, account_id="acc-123")
-
-    assert len(result) == 1
-    assert len(result[0].activity_type) <= 14
-
-
-def test_get_activities_data_truncates_long_description(mock_ws_client):
-    """Test that descriptions longer than 34 characters are truncated."""
-    long_description = "A" * 50  # 50 character description
-    activity = {
-        "type": "BUY",
-        "occurredAt": "2024-01-15T10:30:00Z",
-        "amount": "100.00",
-        "amountSign": "positive",
-        "currency": "CAD",
-        "description": long_description,
-    }
-    mock_ws_client.get_activities.return_value = [activity]
+@pytest.mark.parametrize(
+    "field,value,attr,max_len",
+    [
+        pytest.param(
+            "type",
+            "VERY_LONG_TYPE_NAME_THAT_EXCEEDS_14_CHARS",
+            "activity_type",
+            14,
+            id="type",
+        ),
+        pytest.param("description", "A" * 50, "description", 34, id="description"),
+    ],
+)
+def test_get_activities_data_truncates(mock_ws_client, field, value, attr, max_len):
+    """Test that long activity types and descriptions are truncated."""
+    mock_ws_client.get_activities.return_value = [
+        {**_TRUNCATION_ACTIVITY, field: value}
+    ]
     mock_ws_client.get_security_market_data.return_value = None
 
     result = get_activities_data(mock_ws_client, account_id="acc-123")
 
     assert len(result) == 1
-    assert len(result[0].description) <= 34
+    assert len(getattr(result[0], attr)) <= max_len
 
 
 def test_print_activities_amount_signs(mock_ws_client, capsys):
     """Test that amount signs are displayed correctly."""
-    mock_ws_client.get_accounts.return_value = [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}
-    ]
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
     mock_ws_client.get_activities.return_value = [
         {
             "type": "DIY_DIVIDEND",
@@ -561,20 +592,62 @@ def test_print_activities_amount_signs(mock_ws_client, capsys):
 
     print_activities(mock_ws_client)
 
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
-    # Find lines with dividend and buy activities
-    dividend_line = None
-    buy_line = None
-    for line in lines:
-        if "Dividend" in line:
-            dividend_line = line
-        if "Buy" in line and "DIY_BUY" in line:
-            buy_line = line
-
-    if dividend_line:
-        assert "+" in dividend_line
-        assert "50.00" in dividend_line
-    if buy_line:
-        assert "-" in buy_line
-        assert "100.00" in buy_line
+    out = capsys.readouterr().out
+    assert re.search(r"DIY_DIVIDEND.*Dividend.*\+.*50\.00", out)
+    assert re.search(r"DIY_BUY.*Buy.*-.*100\.00", out)
+
+
+def test_get_activities_data_prefetches_securities_once(mock_ws_client):
+    """Test that each referenced security is looked up once across accounts."""
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS
+    mock_ws_client.get_activities.return_value = [
+        {
+            "type": "DIY_DIVIDEND",
+            "description": "Dividend: [sec-s-abc123",
+            "occurredAt": "2024-01-15T10:30:00Z",
+            "amountSign": "positive",
+            "amount": "10.00",
+            "currency": "CAD",
+        }
+    ]
+    mock_ws_client.get_security_market_data.return_value = {
+        "stock": {"symbol": "XEQT", "name": "iShares All-Equity ETF"}
+    }
+
+    result = get_activities_data(mock_ws_client)
+
+    assert len(result) == 2
+    assert all("XEQT" in act.description for act in result)
+    mock_ws_client.get_security_market_data.assert_called_once()
+
+
+def test_get_activities_data_prefetches_only_used_securities(mock_ws_client):
+    """Test IDs that _enhance_description won't replace are not looked up."""
+    mock_ws_client.get_accounts.return_value = _BASE_ACCOUNTS[:1]
+    mock_ws_client.get_activities.return_value = [
+        {
+            "type": "DIY_BUY",
+            "security": {"id": "sec-s-direct"},
+            "description": "Buy [sec-s-abc123 and [sec-s-def456",
+            "occurredAt": "2024-01-15T10:30:00Z",
+            "amountSign": "negative",
+            "amount": "10.00",
+            "currency": "CAD",
+        },
+        {
+            "type": "DIY_DIVIDEND",
+            "description": "Dividend: [sec-s-aaa111 [sec-s-bbb222",
+            "occurredAt": "2024-01-14T10:30:00Z",
+            "amountSign": "positive",
+            "amount": "1.00",
+            "currency": "CAD",
+        },
+    ]
+    mock_ws_client.get_security_market_data.return_value = None
+
+    get_activities_data(mock_ws_client)
+
+    looked_up = {
+        c.args[0] for c in mock_ws_client.get_security_market_data.call_args_list
+    }
+    assert looked_up == {"sec-s-direct", "sec-s-aaa111"}
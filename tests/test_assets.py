@@ -1,79 +1,121 @@
-from unittest.mock import MagicMock
+import io
+import json
+import re
+from types import MappingProxyType
+from unittest.mock import Mock
 
 import pytest
+from ws_api import WealthsimpleAPI
 
 from wealthgrabber.assets import (
-    _get_position_account_ids,
     _position_has_account,
     get_assets_data,
     print_assets,
 )
 
+# Assets table header; "." stays on one line
+_HEADER_RE = re.compile(r"Symbol.*Name.*Qty.*Market Value.*P&L")
+
+# Separator lines of the 94-column assets table
+_SEP_EQ = "=" * 94
+_SEP_DASH = "-" * 94
+
+# Market data returned by the mocked ws.get_security_market_data()
+_SECURITY_MAP: dict[str, dict] = {
+    "sec-s-xeqt": {"stock": {"symbol": "XEQT", "name": "iShares Core Equity ETF"}},
+    "sec-s-vfv": {"stock": {"symbol": "VFV", "name": "Vanguard S&P 500 ETF"}},
+    "sec-s-large": {"stock": {"symbol": "LARGE", "name": "Large Position Fund"}},
+}
+_UNKNOWN_SECURITY = {"stock": {"symbol": "N/A", "name": "Unknown"}}
+
+# Read-only accounts as returned by ws.get_accounts()
+_SAMPLE_ACCOUNTS = (
+    MappingProxyType({"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"}),
+    MappingProxyType({"number": "RRSP-001", "id": "acc-456", "description": "My RRSP"}),
+)
 
-@pytest.fixture
-def mock_ws_client():
-    client = MagicMock()
-
-    # Mock get_security_market_data to return stock info based on security ID
-    def mock_market_data(security_id, use_cache=False):
-        mapping = {
-            "sec-s-xeqt": {
-                "stock": {"symbol": "XEQT", "name": "iShares Core Equity ETF"}
-            },
-            "sec-s-vfv": {"stock": {"symbol": "VFV", "name": "Vanguard S&P 500 ETF"}},
-            "sec-s-large": {
-                "stock": {"symbol": "LARGE", "name": "Large Position Fund"}
-            },
-        }
-        return mapping.get(security_id, {"stock": {"symbol": "N/A", "name": "Unknown"}})
 
-    client.get_security_market_data.side_effect = mock_market_data
+@pytest.fixture(scope="session")
+def _ws_client_template():
+    client = Mock(spec=WealthsimpleAPI)
+
+    # Return stock info based on security ID
+    client.get_security_market_data.side_effect = lambda security_id, use_cache=False: (
+        _SECURITY_MAP.get(security_id, _UNKNOWN_SECURITY)
+    )
     return client
 
 
 @pytest.fixture
-def sample_position():
-    return {
-        "id": "pos-123",
-        "quantity": "100.50",
-        "accounts": [{"id": "acc-123", "__typename": "Account"}],
-        "security": {"id": "sec-s-xeqt", "__typename": "Security"},
-        "totalValue": {"amount": "2525.00", "currency": "CAD"},
-        "bookValue": {"amount": "2400.00", "currency": "CAD"},
-    }
+def mock_ws_client(_ws_client_template):
+    """Shared client with per-test calls and return values cleared."""
+    # Keep side effects so the market data lookup stays wired
+    _ws_client_template.reset_mock(return_value=True, side_effect=False)
+    return _ws_client_template
 
 
 @pytest.fixture
-def sample_position_2():
-    return {
-        "id": "pos-456",
-        "quantity": "50.00",
-        "accounts": [{"id": "acc-456", "__typename": "Account"}],
-        "security": {"id": "sec-s-vfv", "__typename": "Security"},
-        "totalValue": {"amount": "3150.00", "currency": "CAD"},
-        "bookValue": {"amount": "3000.00", "currency": "CAD"},
-    }
+def set_positions(mock_ws_client):
+    """Setter wiring the shared client to return the given positions."""
+
+    def _set(*positions):
+        mock_ws_client.get_identity_positions.return_value = list(positions)
+
+    return _set
 
 
 @pytest.fixture
+def output():
+    """Stream that print_assets writes to in place of stdout."""
+    return io.StringIO()
+
+
+@pytest.fixture(scope="session")
+def sample_position():
+    return MappingProxyType(
+        {
+            "id": "pos-123",
+            "quantity": "100.50",
+            "accounts": [{"id": "acc-123", "__typename": "Account"}],
+            "security": {"id": "sec-s-xeqt", "__typename": "Security"},
+            "totalValue": {"amount": "2525.00", "currency": "CAD"},
+            "bookValue": {"amount": "2400.00", "currency": "CAD"},
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_position_2():
+    return MappingProxyType(
+        {
+            "id": "pos-456",
+            "quantity": "50.00",
+            "accounts": [{"id": "acc-456", "__typename": "Account"}],
+            "security": {"id": "sec-s-vfv", "__typename": "Security"},
+            "totalValue": {"amount": "3150.00", "currency": "CAD"},
+            "bookValue": {"amount": "3000.00", "currency": "CAD"},
+        }
+    )
+
+
+@pytest.fixture(scope="session")
 def sample_position_loss():
     """Position with a loss (market value < book value)."""
-    return {
-        "id": "pos-loss",
-        "quantity": "200.00",
-        "accounts": [{"id": "acc-123", "__typename": "Account"}],
-        "security": {"id": "sec-s-large", "__typename": "Security"},
-        "totalValue": {"amount": "1800.00", "currency": "CAD"},
-        "bookValue": {"amount": "2000.00", "currency": "CAD"},
-    }
+    return MappingProxyType(
+        {
+            "id": "pos-loss",
+            "quantity": "200.00",
+            "accounts": [{"id": "acc-123", "__typename": "Account"}],
+            "security": {"id": "sec-s-large", "__typename": "Security"},
+            "totalValue": {"amount": "1800.00", "currency": "CAD"},
+            "bookValue": {"amount": "2000.00", "currency": "CAD"},
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_accounts():
-    return [
-        {"number": "TFSA-001", "id": "acc-123", "description": "My TFSA"},
-        {"number": "RRSP-001", "id": "acc-456", "description": "My RRSP"},
-    ]
+    return _SAMPLE_ACCOUNTS
 
 
 # Tests for helper functions
@@ -87,168 +129,138 @@ def test_position_has_account_false(sample_position):
     assert _position_has_account(sample_position, "acc-999") is False
 
 
-def test_get_position_account_ids(sample_position):
-    """Test getting account IDs from position."""
-    assert _get_position_account_ids(sample_position) == ["acc-123"]
-
-
-def test_get_position_account_ids_empty():
-    """Test getting account IDs when empty."""
-    assert _get_position_account_ids({}) == []
-
-
 # Tests for print_assets
-def test_print_assets_aggregated(mock_ws_client, sample_position, capsys):
+def test_print_assets_aggregated(
+    mock_ws_client, set_positions, sample_position, output
+):
     """Test printing aggregated assets."""
-    mock_ws_client.get_identity_positions.return_value = [sample_position]
+    set_positions(sample_position)
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
+    out = output.getvalue()
+    stripped = frozenset(line.strip() for line in out.split("\n"))
 
     # Validate table structure: header row
-    assert any(
-        "Symbol" in line
-        and "Name" in line
-        and "Qty" in line
-        and "Market Value" in line
-        and "P&L" in line
-        for line in lines
-    )
+    assert _HEADER_RE.search(out)
 
     # Validate separator lines (94 chars for assets table)
-    assert any(line.strip() == "=" * 94 for line in lines)
-    assert any(line.strip() == "-" * 94 for line in lines)
+    assert _SEP_EQ in stripped
+    assert _SEP_DASH in stripped
 
-    # Find data row with position info
-    data_row = None
-    for line in lines:
-        if "XEQT" in line and "100.50" in line and "2,525.00" in line:
-            data_row = line
-            break
-
-    assert data_row is not None, "Expected data row with position info not found"
+    assert re.search(r"XEQT.*100\.50.*2,525\.00", out), (
+        "Expected data row with position info not found"
+    )
 
     # Validate total row
-    assert any("Total" in line and "2,525.00" in line for line in lines)
+    assert re.search(r"Total.*2,525\.00", out)
 
 
+@pytest.mark.slow
 def test_print_assets_multiple_positions(
-    mock_ws_client, sample_position, sample_position_2, capsys
+    mock_ws_client, set_positions, sample_position, sample_position_2, output
 ):
     """Test printing multiple positions with total."""
-    mock_ws_client.get_identity_positions.return_value = [
-        sample_position,
-        sample_position_2,
-    ]
+    set_positions(sample_position, sample_position_2)
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
-    lines = captured.out.split("\n")
+    out = output.getvalue()
+    stripped = frozenset(line.strip() for line in out.split("\n"))
 
     # Validate table structure: header row
-    assert any(
-        "Symbol" in line
-        and "Name" in line
-        and "Qty" in line
-        and "Market Value" in line
-        and "P&L" in line
-        for line in lines
-    )
+    assert _HEADER_RE.search(out)
 
     # Validate separator lines
-    assert any(line.strip() == "=" * 94 for line in lines)
-    assert any(line.strip() == "-" * 94 for line in lines)
+    assert _SEP_EQ in stripped
+    assert _SEP_DASH in stripped
 
     # Find both position rows
-    xeqt_row = None
-    vfv_row = None
-    for line in lines:
-        if "XEQT" in line and "100.50" in line:
-            xeqt_row = line
-        if "VFV" in line and "50.00" in line:
-            vfv_row = line
-
-    assert xeqt_row is not None, "Expected XEQT position row not found"
-    assert vfv_row is not None, "Expected VFV position row not found"
+    assert re.search(r"XEQT.*100\.50", out), "Expected XEQT position row not found"
+    assert re.search(r"VFV.*50\.00", out), "Expected VFV position row not found"
 
     # Validate total row
-    assert any("Total" in line and "5,675.00" in line for line in lines)
+    assert re.search(r"Total.*5,675\.00", out)
 
 
-def test_print_assets_no_positions(mock_ws_client, capsys):
+@pytest.mark.slow
+def test_print_assets_no_positions(mock_ws_client, set_positions, output):
     """Test behavior when no positions exist."""
-    mock_ws_client.get_identity_positions.return_value = []
+    set_positions()
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
-    assert "No positions found" in captured.out
+    out = output.getvalue()
+    assert "No positions found" in out
 
 
+@pytest.mark.slow
 def test_print_assets_single_account_filter(
-    mock_ws_client, sample_position, sample_position_2, capsys
+    mock_ws_client, set_positions, sample_position, sample_position_2, output
 ):
     """Test filtering by account ID."""
-    mock_ws_client.get_identity_positions.return_value = [
-        sample_position,
-        sample_position_2,
-    ]
+    set_positions(sample_position, sample_position_2)
 
-    print_assets(mock_ws_client, account_id="acc-123")
+    print_assets(mock_ws_client, account_id="acc-123", out=output)
 
-    captured = capsys.readouterr()
-    assert "XEQT" in captured.out
-    assert "VFV" not in captured.out  # Should be filtered out
+    out = output.getvalue()
+    assert "XEQT" in out
+    assert "VFV" not in out  # Should be filtered out
 
 
+@pytest.mark.slow
 def test_print_assets_by_account(
-    mock_ws_client, sample_position, sample_position_2, sample_accounts, capsys
+    mock_ws_client,
+    set_positions,
+    sample_position,
+    sample_position_2,
+    sample_accounts,
+    output,
 ):
     """Test printing assets grouped by account."""
     mock_ws_client.get_accounts.return_value = sample_accounts
-    mock_ws_client.get_identity_positions.return_value = [
-        sample_position,
-        sample_position_2,
-    ]
+    set_positions(sample_position, sample_position_2)
 
-    print_assets(mock_ws_client, by_account=True)
+    print_assets(mock_ws_client, by_account=True, out=output)
 
-    captured = capsys.readouterr()
-    assert "My TFSA" in captured.out
-    assert "My RRSP" in captured.out
-    assert "XEQT" in captured.out
-    assert "VFV" in captured.out
-    assert "Grand Total" in captured.out
-    assert "5,675.00" in captured.out
+    out = output.getvalue()
+    assert "My TFSA" in out
+    assert "My RRSP" in out
+    assert "XEQT" in out
+    assert "VFV" in out
+    assert "Grand Total" in out
+    assert "5,675.00" in out
 
 
-def test_print_assets_by_account_no_accounts(mock_ws_client, capsys):
+@pytest.mark.slow
+def test_print_assets_by_account_no_accounts(mock_ws_client, set_positions, output):
     """Test by-account mode when no accounts exist."""
     mock_ws_client.get_accounts.return_value = []
-    mock_ws_client.get_identity_positions.return_value = []
+    set_positions()
 
-    print_assets(mock_ws_client, by_account=True)
+    print_assets(mock_ws_client, by_account=True, out=output)
 
-    captured = capsys.readouterr()
+    out = output.getvalue()
     # When there are no accounts, no positions are found
-    assert "No positions found" in captured.out
+    assert "No positions found" in out
 
 
-def test_print_assets_by_account_no_positions(mock_ws_client, sample_accounts, capsys):
+@pytest.mark.slow
+def test_print_assets_by_account_no_positions(
+    mock_ws_client, set_positions, sample_accounts, output
+):
     """Test by-account mode when no positions exist."""
     mock_ws_client.get_accounts.return_value = sample_accounts
-    mock_ws_client.get_identity_positions.return_value = []
+    set_positions()
 
-    print_assets(mock_ws_client, by_account=True)
+    print_assets(mock_ws_client, by_account=True, out=output)
 
-    captured = capsys.readouterr()
-    assert "No positions found" in captured.out
+    out = output.getvalue()
+    assert "No positions found" in out
 
 
-def test_print_assets_formats_currency(mock_ws_client, capsys):
+@pytest.mark.slow
+def test_print_assets_formats_currency(mock_ws_client, set_positions, output):
     """Test that currency values are formatted correctly."""
     position = {
         "id": "pos-789",
@@ -257,16 +269,35 @@ def test_print_assets_formats_currency(mock_ws_client, capsys):
         "security": {"id": "sec-s-large"},
         "totalValue": {"amount": "123456.78", "currency": "CAD"},
     }
-    mock_ws_client.get_identity_positions.return_value = [position]
+    set_positions(position)
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
+    out = output.getvalue()
     # Check thousands separator formatting
-    assert "123,456.78" in captured.out
+    assert "123,456.78" in out
+
+
+def test_print_assets_json_totals_are_exact(mock_ws_client, set_positions, output):
+    """Test JSON totals don't accumulate float rounding error."""
+    position = {
+        "quantity": "1",
+        "accounts": [{"id": "acc-123"}],
+        "security": {"id": "sec-s-xeqt"},
+        "totalValue": {"amount": "0.1", "currency": "CAD"},
+        "bookValue": {"amount": "0.1", "currency": "CAD"},
+    }
+    set_positions(*[position] * 10)
 
+    print_assets(mock_ws_client, output_format="json", out=output)
 
-def test_print_assets_handles_missing_data(mock_ws_client, capsys):
+    totals = json.loads(output.getvalue())["totals"]
+    assert totals["market_value"] == 1.0
+    assert totals["book_value"] == 1.0
+
+
+@pytest.mark.slow
+def test_print_assets_handles_missing_data(mock_ws_client, set_positions, output):
     """Test handling of positions with missing data."""
     position = {
         "id": "pos-incomplete",
@@ -275,50 +306,51 @@ def test_print_assets_handles_missing_data(mock_ws_client, capsys):
         "security": {},  # Missing ID
         "totalValue": {},  # Missing amount
     }
-    mock_ws_client.get_identity_positions.return_value = [position]
+    set_positions(position)
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
-    assert "N/A" in captured.out  # Symbol fallback
+    out = output.getvalue()
+    assert "N/A" in out  # Symbol fallback
 
 
-def test_print_assets_displays_pnl(mock_ws_client, sample_position, capsys):
+@pytest.mark.slow
+def test_print_assets_displays_pnl(
+    mock_ws_client, set_positions, sample_position, output
+):
     """Test that P&L (Profit/Loss) is displayed correctly."""
     # sample_position has totalValue=2525 and bookValue=2400
     # P&L should be +125.00 and +5.2%
-    mock_ws_client.get_identity_positions.return_value = [sample_position]
+    set_positions(sample_position)
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
-    assert "P&L" in captured.out  # Header should contain P&L column
-    assert "+125.00" in captured.out  # P&L value (2525 - 2400 = 125)
+    out = output.getvalue()
+    assert "P&L" in out  # Header should contain P&L column
+    assert "+125.00" in out  # P&L value (2525 - 2400 = 125)
     # P&L percentage: (125 / 2400) * 100 = 5.208...% ≈ 5.2%
     # Allow for rounding variance (5.2% or 5.21%)
-    assert "+5.2%" in captured.out or "+5.21%" in captured.out
+    assert "+5.2%" in out or "+5.21%" in out
 
 
+@pytest.mark.slow
 def test_print_assets_displays_total_pnl(
-    mock_ws_client, sample_position, sample_position_2, capsys
+    mock_ws_client, set_positions, sample_position, sample_position_2, output
 ):
     """Test that total P&L is calculated correctly."""
     # sample_position: totalValue=2525, bookValue=2400 -> P&L=125
     # sample_position_2: totalValue=3150, bookValue=3000 -> P&L=150
     # Total: totalValue=5675, bookValue=5400 -> P&L=275, pct=5.09%
-    mock_ws_client.get_identity_positions.return_value = [
-        sample_position,
-        sample_position_2,
-    ]
+    set_positions(sample_position, sample_position_2)
 
-    print_assets(mock_ws_client)
+    print_assets(mock_ws_client, out=output)
 
-    captured = capsys.readouterr()
-    assert "+275.00" in captured.out  # Total P&L
-    assert "+5.1%" in captured.out  # Total P&L percentage (275/5400 = 5.09%)
+    out = output.getvalue()
+    assert "+275.00" in out  # Total P&L
+    assert "+5.1%" in out  # Total P&L percentage (275/5400 = 5.09%)
 
 
-def test_get_assets_data_zero_book_value(mock_ws_client):
+def test_get_assets_data_zero_book_value(mock_ws_client, set_positions):
     """Test P&L calculation when book value is zero."""
     position = {
         "id": "pos-1",
@@ -328,7 +360,7 @@ def test_get_assets_data_zero_book_value(mock_ws_client):
         "totalValue": {"amount": "1000.00", "currency": "CAD"},
         "bookValue": {"amount": "0.00", "currency": "CAD"},  # Zero book value
     }
-    mock_ws_client.get_identity_positions.return_value = [position]
+    set_positions(position)
 
     result = get_assets_data(mock_ws_client)
 
@@ -337,67 +369,50 @@ def test_get_assets_data_zero_book_value(mock_ws_client):
     assert result[0].pnl_pct == 0.0  # Should be 0.0 when book_value is 0
 
 
-# Tests for profit/loss filtering
-def test_get_assets_data_filter_profits_only(
-    mock_ws_client, sample_position, sample_position_2, sample_position_loss
+def test_get_assets_data_prefetches_securities_once(
+    mock_ws_client, set_positions, sample_position
 ):
-    """Test filtering to show only positions with profit."""
-    mock_ws_client.get_identity_positions.return_value = [
-        sample_position,  # P&L = +125
-        sample_position_2,  # P&L = +150
-        sample_position_loss,  # P&L = -200
-    ]
-
-    result = get_assets_data(mock_ws_client, pnl_filter="profit")
+    """Test that a security held in several positions is looked up once."""
+    duplicate = {**sample_position, "id": "pos-dup"}
+    set_positions(sample_position, duplicate)
 
-    assert len(result) == 2
-    # Both profitable positions should be included
-    symbols = [pos.symbol for pos in result]
-    assert "XEQT" in symbols
-    assert "VFV" in symbols
-    assert "LARGE" not in symbols  # Loss position should be excluded
-    # Verify all have positive P&L
-    assert all(pos.pnl > 0 for pos in result)
-
-
-def test_get_assets_data_filter_losses_only(
-    mock_ws_client, sample_position, sample_position_2, sample_position_loss
-):
-    """Test filtering to show only positions with loss."""
-    mock_ws_client.get_identity_positions.return_value = [
-        sample_position,  # P&L = +125
-        sample_position_2,  # P&L = +150
-        sample_position_loss,  # P&L = -200
-    ]
-
-    result = get_assets_data(mock_ws_client, pnl_filter="loss")
+    result = get_assets_data(mock_ws_client)
 
-    assert len(result) == 1
-    # Only loss position should be included
-    assert result[0].symbol == "LARGE"
-    assert result[0].pnl < 0
+    assert [pos.symbol for pos in result] == ["XEQT", "XEQT"]
+    mock_ws_client.get_security_market_data.assert_called_once()
 
 
-def test_get_assets_data_no_filter_shows_all(
-    mock_ws_client, sample_position, sample_position_2, sample_position_loss
+# Tests for profit/loss filtering
+@pytest.mark.parametrize(
+    "flt,expected",
+    [
+        pytest.param("profit", {"XEQT", "VFV"}, id="profits_only"),
+        pytest.param("loss", {"LARGE"}, id="losses_only"),
+        pytest.param(None, {"XEQT", "VFV", "LARGE"}, id="no_filter_shows_all"),
+    ],
+)
+def test_get_assets_data_pnl_filter(
+    mock_ws_client,
+    set_positions,
+    sample_position,
+    sample_position_2,
+    sample_position_loss,
+    flt,
+    expected,
 ):
-    """Test default behavior shows all positions (no filter)."""
-    mock_ws_client.get_identity_positions.return_value = [
+    """Test filtering positions by profit or loss."""
+    set_positions(
         sample_position,  # P&L = +125
         sample_position_2,  # P&L = +150
         sample_position_loss,  # P&L = -200
-    ]
+    )
 
-    result = get_assets_data(mock_ws_client, pnl_filter=None)
+    result = get_assets_data(mock_ws_client, pnl_filter=flt)
 
-    assert len(result) == 3
-    symbols = [pos.symbol for pos in result]
-    assert "XEQT" in symbols
-    assert "VFV" in symbols
-    assert "LARGE" in symbols
+    assert {pos.symbol for pos in result} == expected
 
 
-def test_get_assets_data_filter_profits_with_zero_pnl(mock_ws_client):
+def test_get_assets_data_filter_profits_with_zero_pnl(mock_ws_client, set_positions):
     """Test that positions with exactly zero P&L are excluded from profit filter."""
     position_profit = {
         "id": "pos-profit",
@@ -415,10 +430,7 @@ def test_get_assets_data_filter_profits_with_zero_pnl(mock_ws_client):
         "totalValue": {"amount": "1000.00", "currency": "CAD"},
         "bookValue": {"amount": "1000.00", "currency": "CAD"},  # P&L = 0
     }
-    mock_ws_client.get_identity_positions.return_value = [
-        position_profit,
-        position_zero,
-    ]
+    set_positions(position_profit, position_zero)
 
     result = get_assets_data(mock_ws_client, pnl_filter="profit")
 
@@ -427,51 +439,72 @@ def test_get_assets_data_filter_profits_with_zero_pnl(mock_ws_client):
     assert result[0].pnl > 0
 
 
-def test_print_assets_filter_profits_only(
-    mock_ws_client, sample_position, sample_position_loss, capsys
+def test_get_assets_data_filter_skips_excluded_lookups(
+    mock_ws_client, set_positions, sample_position, sample_position_loss
 ):
-    """Test printing assets filtered to show only profits."""
-    mock_ws_client.get_identity_positions.return_value = [
+    """Test that positions removed by the P&L filter are never looked up."""
+    set_positions(
         sample_position,  # P&L = +125
         sample_position_loss,  # P&L = -200
-    ]
+    )
 
-    print_assets(mock_ws_client, pnl_filter="profit")
+    get_assets_data(mock_ws_client, pnl_filter="profit")
 
-    captured = capsys.readouterr()
-    assert "XEQT" in captured.out
-    assert "LARGE" not in captured.out  # Loss position should be filtered out
+    mock_ws_client.get_security_market_data.assert_called_once_with(
+        "sec-s-xeqt", use_cache=False
+    )
 
 
-def test_print_assets_filter_losses_only(
-    mock_ws_client, sample_position, sample_position_loss, capsys
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "flt,present,absent",
+    [
+        pytest.param("profit", "XEQT", "LARGE", id="profits_only"),
+        pytest.param("loss", "LARGE", "XEQT", id="losses_only"),
+    ],
+)
+def test_print_assets_filter(
+    mock_ws_client,
+    set_positions,
+    sample_position,
+    sample_position_loss,
+    output,
+    flt,
+    present,
+    absent,
 ):
-    """Test printing assets filtered to show only losses."""
-    mock_ws_client.get_identity_positions.return_value = [
+    """Test printing assets filtered to show only profits or only losses."""
+    set_positions(
         sample_position,  # P&L = +125
         sample_position_loss,  # P&L = -200
-    ]
+    )
 
-    print_assets(mock_ws_client, pnl_filter="loss")
+    print_assets(mock_ws_client, pnl_filter=flt, out=output)
 
-    captured = capsys.readouterr()
-    assert "LARGE" in captured.out
-    assert "XEQT" not in captured.out  # Profit position should be filtered out
+    out = output.getvalue()
+    assert present in out
+    assert absent not in out  # Filtered-out position must not be printed
 
 
+@pytest.mark.slow
 def test_print_assets_filter_with_by_account(
-    mock_ws_client, sample_position, sample_position_loss, sample_accounts, capsys
+    mock_ws_client,
+    set_positions,
+    sample_position,
+    sample_position_loss,
+    sample_accounts,
+    output,
 ):
     """Test profit/loss filter works with by-account mode."""
     mock_ws_client.get_accounts.return_value = sample_accounts
-    mock_ws_client.get_identity_positions.return_value = [
+    set_positions(
         sample_position,  # P&L = +125
         sample_position_loss,  # P&L = -200
-    ]
+    )
 
-    print_assets(mock_ws_client, by_account=True, pnl_filter="profit")
+    print_assets(mock_ws_client, by_account=True, pnl_filter="profit", out=output)
 
-    captured = capsys.readouterr()
-    assert "XEQT" in captured.out
-    assert "LARGE" not in captured.out
-    assert "My TFSA" in captured.out
+    out = output.getvalue()
+    assert "XEQT" in out
+    assert "LARGE" not in out
+    assert "My TFSA" in out
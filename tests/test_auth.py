@@ -1,37 +1,97 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, create_autospec, patch
 
+import keyring
 import pytest
+from ws_api import WealthsimpleAPI, WSAPISession
 
+from wealthgrabber import auth
 from wealthgrabber.auth import _persist_session, get_authenticated_client, logout
 
 
-@patch("wealthgrabber.auth.keyring")
-def test_persist_session(mock_keyring):
+@pytest.fixture(scope="session")
+def _keyring_template():
+    return Mock(spec_set=keyring)
+
+
+@pytest.fixture(autouse=True)
+def mock_auth_keyring(_keyring_template, monkeypatch):
+    """Replace the keyring backend with a shared, per-test reset mock."""
+    _keyring_template.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("wealthgrabber.auth.keyring", _keyring_template)
+    return _keyring_template
+
+
+@pytest.fixture(scope="session")
+def _ws_api_template():
+    return create_autospec(WealthsimpleAPI)
+
+
+@pytest.fixture(scope="session")
+def _ws_session_template():
+    return create_autospec(WSAPISession)
+
+
+@pytest.fixture
+def mock_ws_api(_ws_api_template, monkeypatch):
+    """Replace the WealthsimpleAPI class with a shared, per-test reset mock."""
+    _ws_api_template.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("wealthgrabber.auth.WealthsimpleAPI", _ws_api_template)
+    return _ws_api_template
+
+
+@pytest.fixture
+def mock_session_cls(_ws_session_template, monkeypatch):
+    """Replace the WSAPISession class with a shared, per-test reset mock."""
+    _ws_session_template.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("wealthgrabber.auth.WSAPISession", _ws_session_template)
+    return _ws_session_template
+
+
+@pytest.fixture(autouse=True)
+def clear_keyring_cache():
+    """Start each test without cached keyring reads."""
+    auth._keyring_cache.clear()
+    yield
+    auth._keyring_cache.clear()
+
+
+def test_persist_session(mock_auth_keyring):
     """Test session persistence calls keyring."""
     _persist_session('{"token": "123"}', "testuser")
-    mock_keyring.set_password.assert_called_with(
+    mock_auth_keyring.set_password.assert_called_with(
         "wealthsimple-account-viewer.testuser", "session", '{"token": "123"}'
     )
 
 
-@patch("wealthgrabber.auth.keyring")
-@patch("wealthgrabber.auth.WSAPISession")
-@patch("wealthgrabber.auth.WealthsimpleAPI")
+def test_keyring_reads_are_cached(mock_auth_keyring):
+    """Test keyring values are read once and kept in sync on writes."""
+    mock_auth_keyring.get_password.return_value = '{"token": "old"}'
+    service = "wealthsimple-account-viewer.testuser"
+
+    assert auth._keyring_get(service, "session") == '{"token": "old"}'
+    assert auth._keyring_get(service, "session") == '{"token": "old"}'
+    mock_auth_keyring.get_password.assert_called_once()
+
+    _persist_session('{"token": "new"}', "testuser")
+    assert auth._keyring_get(service, "session") == '{"token": "new"}'
+    mock_auth_keyring.get_password.assert_called_once()
+
+
 @patch("builtins.print")
 def test_get_authenticated_client_existing_session(
-    mock_print, mock_ws_api, mock_session_cls, mock_keyring
+    mock_print, mock_auth_keyring, mock_ws_api, mock_session_cls
 ):
     """Test reusing an existing valid session."""
     # First call gets cached email, second call gets session
-    mock_keyring.get_password.side_effect = [
+    mock_auth_keyring.get_password.side_effect = [
         "testuser@example.com",
         '{"valid": "json"}',
     ]
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec_set=WSAPISession)
     mock_session_cls.from_json.return_value = mock_session
 
-    mock_ws = MagicMock()
+    mock_ws = Mock(spec_set=WealthsimpleAPI)
     mock_ws_api.from_token.return_value = mock_ws
 
     # Run
@@ -42,24 +102,21 @@ def test_get_authenticated_client_existing_session(
     mock_ws.get_accounts.assert_called_once()  # Verify it tested the session
     mock_ws_api.login.assert_not_called()
     # Should print that it's using cached email
-    assert any("Using cached email" in str(call) for call in mock_print.call_args_list)
+    mock_print.assert_any_call("Using cached email: testuser@example.com")
 
 
-@patch("wealthgrabber.auth.keyring")
-@patch("wealthgrabber.auth.WSAPISession")
-@patch("wealthgrabber.auth.WealthsimpleAPI")
 @patch("builtins.print")
 def test_get_authenticated_client_expired_session(
-    mock_print, mock_ws_api, mock_session_cls, mock_keyring
+    mock_print, mock_auth_keyring, mock_ws_api, mock_session_cls
 ):
     """Test behavior when existing session is invalid (should trigger login flow - which we will stop at)."""
     # First call gets cached email, second call gets session
-    mock_keyring.get_password.side_effect = [
+    mock_auth_keyring.get_password.side_effect = [
         "testuser@example.com",
         '{"invalid": "json"}',
     ]
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec_set=WSAPISession)
     mock_session_cls.from_json.return_value = mock_session
 
     # Mock from_token to raise exception (invalid session)
@@ -67,9 +124,11 @@ def test_get_authenticated_client_expired_session(
 
     # We want to stop it from entering the infinite loop of login
     # So we'll patch login to raise an exception or mock getpass to stop
-    with patch("wealthgrabber.auth.getpass.getpass", side_effect=KeyboardInterrupt):
-        with pytest.raises(KeyboardInterrupt):
-            get_authenticated_client(force_login=False)
+    with (
+        patch("wealthgrabber.auth.getpass.getpass", side_effect=KeyboardInterrupt),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        get_authenticated_client(force_login=False)
 
     # Verify it tried to use the token but failed
     mock_ws_api.from_token.assert_called()
@@ -79,20 +138,17 @@ def test_get_authenticated_client_expired_session(
 # efficiently which is brittle.
 
 
-@patch("wealthgrabber.auth.keyring")
-@patch("wealthgrabber.auth.WSAPISession")
-@patch("wealthgrabber.auth.WealthsimpleAPI")
 def test_get_authenticated_client_with_explicit_username(
-    mock_ws_api, mock_session_cls, mock_keyring
+    mock_auth_keyring, mock_ws_api, mock_session_cls
 ):
     """Test authentication with explicitly provided username."""
     # Mock session exists for the explicit username
-    mock_keyring.get_password.return_value = '{"valid": "json"}'
+    mock_auth_keyring.get_password.return_value = '{"valid": "json"}'
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec_set=WSAPISession)
     mock_session_cls.from_json.return_value = mock_session
 
-    mock_ws = MagicMock()
+    mock_ws = Mock(spec_set=WealthsimpleAPI)
     mock_ws_api.from_token.return_value = mock_ws
 
     # Run with explicit username
@@ -103,28 +159,25 @@ def test_get_authenticated_client_with_explicit_username(
     # Verify - should NOT check for cached email, should use explicit username
     assert client == mock_ws
     # Should get session for explicit username
-    mock_keyring.get_password.assert_called_with(
+    mock_auth_keyring.get_password.assert_called_with(
         "wealthsimple-account-viewer.explicit@example.com", "session"
     )
 
 
-@patch("wealthgrabber.auth.keyring")
-@patch("wealthgrabber.auth.WSAPISession")
-@patch("wealthgrabber.auth.WealthsimpleAPI")
 @patch("builtins.input")
 def test_get_authenticated_client_no_cached_email(
-    mock_input, mock_ws_api, mock_session_cls, mock_keyring
+    mock_input, mock_auth_keyring, mock_ws_api, mock_session_cls
 ):
     """Test authentication when no cached email exists."""
     # No cached email, user provides email
     mock_input.return_value = "newuser@example.com"
     # First call (get cached email) returns None, second call gets session
-    mock_keyring.get_password.side_effect = [None, '{"valid": "json"}']
+    mock_auth_keyring.get_password.side_effect = [None, '{"valid": "json"}']
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec_set=WSAPISession)
     mock_session_cls.from_json.return_value = mock_session
 
-    mock_ws = MagicMock()
+    mock_ws = Mock(spec_set=WealthsimpleAPI)
     mock_ws_api.from_token.return_value = mock_ws
 
     # Run
@@ -135,64 +188,63 @@ def test_get_authenticated_client_no_cached_email(
     assert client == mock_ws
 
 
-@patch("wealthgrabber.auth.keyring")
 @patch("builtins.print")
-def test_logout_with_cached_username(mock_print, mock_keyring):
+def test_logout_with_cached_username(mock_print, mock_auth_keyring):
     """Test logout with cached username."""
-    mock_keyring.get_password.return_value = "testuser@example.com"
+    mock_auth_keyring.get_password.return_value = "testuser@example.com"
 
     logout()
 
     # Should get cached email
-    mock_keyring.get_password.assert_called_with(
+    mock_auth_keyring.get_password.assert_called_with(
         "wealthsimple-account-viewer", "last_email"
     )
     # Should delete session
-    mock_keyring.delete_password.assert_called_with(
+    mock_auth_keyring.delete_password.assert_called_with(
         "wealthsimple-account-viewer.testuser@example.com", "session"
     )
     # Should print success message
-    assert any("Cleared session" in str(call) for call in mock_print.call_args_list)
+    mock_print.assert_any_call("✓ Cleared session for testuser@example.com")
 
 
-@patch("wealthgrabber.auth.keyring")
 @patch("builtins.print")
-def test_logout_with_explicit_username(mock_print, mock_keyring):
+def test_logout_with_explicit_username(mock_print, mock_auth_keyring):
     """Test logout with explicitly provided username."""
     logout(username="specific@example.com")
 
     # Should NOT get cached email
-    mock_keyring.get_password.assert_not_called()
+    mock_auth_keyring.get_password.assert_not_called()
     # Should delete session for specific user
-    mock_keyring.delete_password.assert_called_with(
+    mock_auth_keyring.delete_password.assert_called_with(
         "wealthsimple-account-viewer.specific@example.com", "session"
     )
 
 
-@patch("wealthgrabber.auth.keyring")
 @patch("builtins.print")
-def test_logout_clear_email(mock_print, mock_keyring):
+def test_logout_clear_email(mock_print, mock_auth_keyring):
     """Test logout with clear_email flag."""
-    mock_keyring.get_password.return_value = "testuser@example.com"
+    mock_auth_keyring.get_password.return_value = "testuser@example.com"
 
     logout(clear_email=True)
 
     # Should delete both session and cached email
-    assert mock_keyring.delete_password.call_count == 2
-    calls = [str(call) for call in mock_keyring.delete_password.call_args_list]
-    assert any("session" in call for call in calls)
-    assert any("last_email" in call for call in calls)
+    assert mock_auth_keyring.delete_password.call_count == 2
+    mock_auth_keyring.delete_password.assert_any_call(
+        "wealthsimple-account-viewer.testuser@example.com", "session"
+    )
+    mock_auth_keyring.delete_password.assert_any_call(
+        "wealthsimple-account-viewer", "last_email"
+    )
 
 
-@patch("wealthgrabber.auth.keyring")
 @patch("builtins.print")
-def test_logout_no_cached_username(mock_print, mock_keyring):
+def test_logout_no_cached_username(mock_print, mock_auth_keyring):
     """Test logout when no cached username exists."""
-    mock_keyring.get_password.return_value = None
+    mock_auth_keyring.get_password.return_value = None
 
     logout()
 
     # Should print message about no cached session
-    assert any("No cached session" in str(call) for call in mock_print.call_args_list)
+    mock_print.assert_any_call("No cached session found.")
     # Should not try to delete anything
-    mock_keyring.delete_password.assert_not_called()
+    mock_auth_keyring.delete_password.assert_not_called()
@@ -1,380 +1,247 @@
-from unittest.mock import MagicMock, patch
-
-from typer.testing import CliRunner
-
-from wealthgrabber.cli import app
-
-runner = CliRunner()
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_login_command_success(mock_get_auth):
+from unittest.mock import MagicMock
+
+import pytest
+
+from wealthgrabber import __version__
+from wealthgrabber.__main__ import main
+
+# The CLI only passes the client through to mocked functions, so a plain
+# object is enough to check it arrives unchanged
+_SENTINEL_WS = object()
+
+
+# Keyword arguments each command passes through when no options are given
+_LIST_DEFAULTS = {
+    "show_zero_balances": True,
+    "liquid_only": False,
+    "not_liquid": False,
+    "output_format": "table",
+    "verbose": False,
+}
+_ACTIVITIES_DEFAULTS = {
+    "account_id": None,
+    "dividends_only": False,
+    "limit": 50,
+    "output_format": "table",
+    "verbose": False,
+}
+_ASSETS_DEFAULTS = {
+    "account_id": None,
+    "by_account": False,
+    "output_format": "table",
+    "verbose": False,
+    "pnl_filter": None,
+}
+
+
+# Functions the CLI commands call, named where they are defined
+_CLI_TARGETS = (
+    "auth.get_authenticated_client",
+    "auth.logout",
+    "accounts.print_accounts",
+    "activities.print_activities",
+    "activities.get_account_id_by_number",
+    "assets.print_assets",
+)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _cli_mocks():
+    """Replace every CLI dependency with a mock once for the whole module."""
+    mocks = {target: MagicMock() for target in _CLI_TARGETS}
+    with pytest.MonkeyPatch.context() as mp:
+        for target, mock in mocks.items():
+            mp.setattr(f"wealthgrabber.{target}", mock)
+        yield mocks
+
+
+@pytest.fixture
+def patch_cli(_cli_mocks):
+    """Hand out the module-wide mocks, reset for this test.
+
+    Overrides the conftest fixture so tests keep calling
+    ``patch_cli("auth.get_authenticated_client")`` without re-patching.
+    """
+    for mock in _cli_mocks.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _cli_mocks.__getitem__
+
+
+@pytest.fixture
+def authed_ws(patch_cli):
+    """Make authentication succeed and return the client commands receive."""
+    patch_cli("auth.get_authenticated_client").return_value = _SENTINEL_WS
+    return _SENTINEL_WS
+
+
+def _run(cli, argv):
+    """Run a command in-process when only the mocked calls are checked.
+
+    Skips CliRunner's output capture and exception wrapping; any error
+    propagates straight to the test.
+    """
+    cli.main(argv, prog_name="wealthgrabber", standalone_mode=False)
+
+
+def test_login_command_success(runner, cli, patch_cli, authed_ws):
     """Test login command success path."""
-    mock_get_auth.return_value = MagicMock()
+    mock_get_auth = patch_cli("auth.get_authenticated_client")
 
-    result = runner.invoke(app, ["login"])
+    result = runner.invoke(cli, ["login"])
 
     assert result.exit_code == 0
     assert "Login routine completed successfully" in result.stdout
     mock_get_auth.assert_called_with(force_login=False, username=None, verbose=False)
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_login_command_force(mock_get_auth):
-    """Test login command with force flag."""
-    mock_get_auth.return_value = MagicMock()
-
-    result = runner.invoke(app, ["login", "--force"])
-
-    assert result.exit_code == 0
-    mock_get_auth.assert_called_with(force_login=True, username=None, verbose=False)
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_login_command_with_username(mock_get_auth):
-    """Test login command with explicit username."""
-    mock_get_auth.return_value = MagicMock()
-
-    result = runner.invoke(app, ["login", "--username", "user@example.com"])
+@pytest.mark.parametrize(
+    "argv,force_login,username",
+    [
+        pytest.param(["--force"], True, None, id="force"),
+        pytest.param(["-f"], True, None, id="force_short"),
+        pytest.param(
+            ["--username", "user@example.com"],
+            False,
+            "user@example.com",
+            id="with_username",
+        ),
+        pytest.param(
+            ["-f", "-u", "user@example.com"], True, "user@example.com", id="all_options"
+        ),
+    ],
+)
+def test_login_command_options(cli, patch_cli, authed_ws, argv, force_login, username):
+    """Test login command option parsing."""
+    mock_get_auth = patch_cli("auth.get_authenticated_client")
+
+    _run(cli, ["login", *argv])
 
-    assert result.exit_code == 0
     mock_get_auth.assert_called_with(
-        force_login=False, username="user@example.com", verbose=False
+        force_login=force_login, username=username, verbose=False
     )
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_login_command_all_options(mock_get_auth):
-    """Test login command with all options."""
-    mock_get_auth.return_value = MagicMock()
-
-    result = runner.invoke(app, ["login", "-f", "-u", "user@example.com"])
-
-    assert result.exit_code == 0
-    mock_get_auth.assert_called_with(
-        force_login=True, username="user@example.com", verbose=False
-    )
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_login_command_failure(mock_get_auth):
-    """Test login command failure."""
-    mock_get_auth.return_value = None
-
-    result = runner.invoke(app, ["login"])
-
-    assert result.exit_code == 1
-    assert "Login routine failed" in result.stdout
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_accounts")
-def test_list_accounts_success(mock_print, mock_get_auth):
+def test_list_accounts_success(cli, patch_cli, authed_ws):
     """Test list accounts command success."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["list"])
-
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        show_zero_balances=True,
-        liquid_only=False,
-        not_liquid=False,
-        output_format="table",
-        verbose=False,
-    )  # Defaults in CLI
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_list_accounts_auth_fail(mock_get_auth):
-    """Test list accounts authentication failure."""
-    mock_get_auth.return_value = None
-
-    result = runner.invoke(app, ["list"])
-
-    assert result.exit_code == 1
-    assert "Could not authenticate" in result.stdout
-
+    mock_print = patch_cli("accounts.print_accounts")
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_accounts")
-def test_list_command_full_flow(mock_print, mock_get_auth):
-    """Test complete flow: auth → print_accounts."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+    _run(cli, ["list"])
 
-    result = runner.invoke(app, ["list"])
-
-    # Verify command succeeded
-    assert result.exit_code == 0
-
-    # Verify print_accounts was called with correct parameters
-    mock_print.assert_called_once_with(
-        mock_ws,
-        show_zero_balances=True,
-        liquid_only=False,
-        not_liquid=False,
-        output_format="table",
-        verbose=False,
-    )
+    mock_print.assert_called_once_with(authed_ws, **_LIST_DEFAULTS)
 
 
 # Activities command tests
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_activities")
-def test_activities_command_success(mock_print, mock_get_auth):
+def test_activities_command_success(cli, patch_cli, authed_ws):
     """Test activities command success path."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+    mock_print = patch_cli("activities.print_activities")
 
-    result = runner.invoke(app, ["activities"])
+    _run(cli, ["activities"])
 
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        dividends_only=False,
-        limit=50,
-        output_format="table",
-        verbose=False,
-    )
+    mock_print.assert_called_with(authed_ws, **_ACTIVITIES_DEFAULTS)
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_activities")
-@patch("wealthgrabber.cli.get_account_id_by_number")
-def test_activities_command_with_account(mock_get_account, mock_print, mock_get_auth):
+def test_activities_command_with_account(cli, patch_cli, authed_ws):
     """Test activities command with account filter."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+    mock_get_account = patch_cli("activities.get_account_id_by_number")
+    mock_print = patch_cli("activities.print_activities")
     mock_get_account.return_value = "acc-123"
 
-    result = runner.invoke(app, ["activities", "--account", "TFSA-001"])
+    _run(cli, ["activities", "--account", "TFSA-001"])
 
-    assert result.exit_code == 0
-    mock_get_account.assert_called_with(mock_ws, "TFSA-001")
+    mock_get_account.assert_called_with(authed_ws, "TFSA-001")
     mock_print.assert_called_with(
-        mock_ws,
-        account_id="acc-123",
-        dividends_only=False,
-        limit=50,
-        output_format="table",
-        verbose=False,
+        authed_ws, **{**_ACTIVITIES_DEFAULTS, "account_id": "acc-123"}
     )
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.get_account_id_by_number")
-def test_activities_command_account_not_found(mock_get_account, mock_get_auth):
-    """Test activities command when account not found."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-    mock_get_account.return_value = None
-
-    result = runner.invoke(app, ["activities", "--account", "INVALID-999"])
-
-    assert result.exit_code == 1
-    assert "not found" in result.stdout
+@pytest.mark.parametrize(
+    "argv,dividends_only,limit",
+    [
+        pytest.param(["--dividends"], True, 50, id="dividends_only"),
+        pytest.param(["-d"], True, 50, id="dividends_short"),
+        pytest.param(["--limit", "25"], False, 25, id="with_limit"),
+        pytest.param(["-d", "-n", "10"], True, 10, id="short_flags"),
+    ],
+)
+def test_activities_command_options(
+    cli, patch_cli, authed_ws, argv, dividends_only, limit
+):
+    """Test activities command flag parsing."""
+    mock_print = patch_cli("activities.print_activities")
 
+    _run(cli, ["activities", *argv])
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_activities")
-def test_activities_command_dividends_only(mock_print, mock_get_auth):
-    """Test activities command with dividends flag."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["activities", "--dividends"])
-
-    assert result.exit_code == 0
     mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        dividends_only=True,
-        limit=50,
-        output_format="table",
-        verbose=False,
-    )
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_activities")
-def test_activities_command_with_limit(mock_print, mock_get_auth):
-    """Test activities command with custom limit."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["activities", "--limit", "25"])
-
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        dividends_only=False,
-        limit=25,
-        output_format="table",
-        verbose=False,
-    )
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_activities_command_auth_fail(mock_get_auth):
-    """Test activities command authentication failure."""
-    mock_get_auth.return_value = None
-
-    result = runner.invoke(app, ["activities"])
-
-    assert result.exit_code == 1
-    assert "Could not authenticate" in result.stdout
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_activities")
-def test_activities_command_api_error(mock_print, mock_get_auth):
-    """Test activities command handles API errors."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-    mock_print.side_effect = Exception("API Error")
-
-    result = runner.invoke(app, ["activities"])
-
-    assert result.exit_code == 1
-    assert "Error fetching activities" in result.stdout
-
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_activities")
-def test_activities_command_short_flags(mock_print, mock_get_auth):
-    """Test activities command with short flag aliases."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["activities", "-d", "-n", "10"])
-
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        dividends_only=True,
-        limit=10,
-        output_format="table",
-        verbose=False,
+        authed_ws,
+        **{**_ACTIVITIES_DEFAULTS, "dividends_only": dividends_only, "limit": limit},
     )
 
 
 # Logout command tests
 
 
-@patch("wealthgrabber.cli.auth_logout")
-def test_logout_command_defaults(mock_logout):
-    """Test logout command with default options."""
-    result = runner.invoke(app, ["logout"])
-
-    assert result.exit_code == 0
-    mock_logout.assert_called_with(username=None, clear_email=False)
-
+@pytest.mark.parametrize(
+    "argv,username,clear_email",
+    [
+        pytest.param([], None, False, id="defaults"),
+        pytest.param(
+            ["--username", "user@example.com"],
+            "user@example.com",
+            False,
+            id="with_username",
+        ),
+        pytest.param(["--clear-email"], None, True, id="clear_email"),
+        pytest.param(
+            ["-u", "user@example.com", "-c"], "user@example.com", True, id="all_options"
+        ),
+    ],
+)
+def test_logout_command_options(cli, patch_cli, argv, username, clear_email):
+    """Test logout command option parsing."""
+    mock_logout = patch_cli("auth.logout")
 
-@patch("wealthgrabber.cli.auth_logout")
-def test_logout_command_with_username(mock_logout):
-    """Test logout command with explicit username."""
-    result = runner.invoke(app, ["logout", "--username", "user@example.com"])
-
-    assert result.exit_code == 0
-    mock_logout.assert_called_with(username="user@example.com", clear_email=False)
-
-
-@patch("wealthgrabber.cli.auth_logout")
-def test_logout_command_clear_email(mock_logout):
-    """Test logout command with clear-email flag."""
-    result = runner.invoke(app, ["logout", "--clear-email"])
-
-    assert result.exit_code == 0
-    mock_logout.assert_called_with(username=None, clear_email=True)
+    _run(cli, ["logout", *argv])
 
-
-@patch("wealthgrabber.cli.auth_logout")
-def test_logout_command_all_options(mock_logout):
-    """Test logout command with all options."""
-    result = runner.invoke(app, ["logout", "-u", "user@example.com", "-c"])
-
-    assert result.exit_code == 0
-    mock_logout.assert_called_with(username="user@example.com", clear_email=True)
+    mock_logout.assert_called_with(username=username, clear_email=clear_email)
 
 
 # Assets command tests
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_assets")
-def test_assets_command_success(mock_print, mock_get_auth):
+def test_assets_command_success(cli, patch_cli, authed_ws):
     """Test assets command success path."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["assets"])
+    mock_print = patch_cli("assets.print_assets")
 
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        by_account=False,
-        output_format="table",
-        verbose=False,
-        pnl_filter=None,
-    )
+    _run(cli, ["assets"])
 
-
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_assets")
-def test_assets_command_with_profits_flag(mock_print, mock_get_auth):
-    """Test assets command with --profits flag."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["assets", "--profits"])
-
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        by_account=False,
-        output_format="table",
-        verbose=False,
-        pnl_filter="profit",
-    )
+    mock_print.assert_called_with(authed_ws, **_ASSETS_DEFAULTS)
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_assets")
-def test_assets_command_with_losses_flag(mock_print, mock_get_auth):
-    """Test assets command with --losses flag."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+@pytest.mark.parametrize(
+    "argv,pnl_filter",
+    [
+        pytest.param(["--profits"], "profit", id="profits"),
+        pytest.param(["-p"], "profit", id="profits_short"),
+        pytest.param(["--losses"], "loss", id="losses"),
+        pytest.param(["-l"], "loss", id="losses_short"),
+    ],
+)
+def test_assets_command_pnl_flags(cli, patch_cli, authed_ws, argv, pnl_filter):
+    """Test assets command --profits/--losses flags and their short forms."""
+    mock_print = patch_cli("assets.print_assets")
 
-    result = runner.invoke(app, ["assets", "--losses"])
+    _run(cli, ["assets", *argv])
 
-    assert result.exit_code == 0
     mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        by_account=False,
-        output_format="table",
-        verbose=False,
-        pnl_filter="loss",
+        authed_ws, **{**_ASSETS_DEFAULTS, "pnl_filter": pnl_filter}
     )
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-def test_assets_command_both_profits_and_losses_flags(mock_get_auth):
+def test_assets_command_both_profits_and_losses_flags(runner, cli, authed_ws):
     """Test assets command errors when both --profits and --losses are specified."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
-
-    result = runner.invoke(app, ["assets", "--profits", "--losses"])
+    result = runner.invoke(cli, ["assets", "--profits", "--losses"])
 
     assert result.exit_code != 0
     assert (
@@ -383,61 +250,90 @@ def test_assets_command_both_profits_and_losses_flags(mock_get_auth):
     )
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_assets")
-def test_assets_command_profits_with_short_flag(mock_print, mock_get_auth):
-    """Test assets command with short -p flag for profits."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+def test_assets_command_profits_with_by_account(cli, patch_cli, authed_ws):
+    """Test assets command with --profits and --by-account flags together."""
+    mock_print = patch_cli("assets.print_assets")
 
-    result = runner.invoke(app, ["assets", "-p"])
+    _run(cli, ["assets", "--profits", "--by-account"])
 
-    assert result.exit_code == 0
     mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        by_account=False,
-        output_format="table",
-        verbose=False,
-        pnl_filter="profit",
+        authed_ws, **{**_ASSETS_DEFAULTS, "by_account": True, "pnl_filter": "profit"}
     )
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_assets")
-def test_assets_command_losses_with_short_flag(mock_print, mock_get_auth):
-    """Test assets command with short -l flag for losses."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+# Error path tests
+
+
+@pytest.mark.parametrize(
+    "argv,target,attr,value,expected_msg",
+    [
+        pytest.param(
+            ["login"],
+            "auth.get_authenticated_client",
+            "return_value",
+            None,
+            "Login routine failed",
+            id="login_failure",
+        ),
+        pytest.param(
+            ["list"],
+            "auth.get_authenticated_client",
+            "return_value",
+            None,
+            "Could not authenticate",
+            id="list_auth_fail",
+        ),
+        pytest.param(
+            ["activities"],
+            "auth.get_authenticated_client",
+            "return_value",
+            None,
+            "Could not authenticate",
+            id="activities_auth_fail",
+        ),
+        pytest.param(
+            ["activities", "--account", "INVALID-999"],
+            "activities.get_account_id_by_number",
+            "return_value",
+            None,
+            "not found",
+            id="activities_account_not_found",
+        ),
+        pytest.param(
+            ["activities"],
+            "activities.print_activities",
+            "side_effect",
+            Exception("API Error"),
+            "Error fetching activities",
+            id="activities_api_error",
+        ),
+    ],
+)
+def test_command_error_paths(
+    runner, cli, patch_cli, authed_ws, argv, target, attr, value, expected_msg
+):
+    """Test commands exit with status 1 and report the failure."""
+    setattr(patch_cli(target), attr, value)
+
+    result = runner.invoke(cli, argv)
+
+    assert result.exit_code == 1
+    assert expected_msg in result.stdout
+
 
-    result = runner.invoke(app, ["assets", "-l"])
+def test_version_option(runner, cli):
+    """Test --version prints the package version."""
+    result = runner.invoke(cli, ["--version"])
 
     assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        by_account=False,
-        output_format="table",
-        verbose=False,
-        pnl_filter="loss",
-    )
+    assert __version__ in result.stdout
 
 
-@patch("wealthgrabber.cli.get_authenticated_client")
-@patch("wealthgrabber.cli.print_assets")
-def test_assets_command_profits_with_by_account(mock_print, mock_get_auth):
-    """Test assets command with --profits and --by-account flags together."""
-    mock_ws = MagicMock()
-    mock_get_auth.return_value = mock_ws
+@pytest.mark.parametrize("flag", ["--version", "-V"])
+def test_main_answers_version_directly(monkeypatch, capsys, flag):
+    """Test the console entry point prints a bare --version itself."""
+    monkeypatch.setattr("sys.argv", ["wealthgrabber", flag])
 
-    result = runner.invoke(app, ["assets", "--profits", "--by-account"])
+    main()
 
-    assert result.exit_code == 0
-    mock_print.assert_called_with(
-        mock_ws,
-        account_id=None,
-        by_account=True,
-        output_format="table",
-        verbose=False,
-        pnl_filter="profit",
-    )
+    assert capsys.readouterr().out == f"{__version__}\n"
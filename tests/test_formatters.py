@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+
+from wealthgrabber import formatters
+from wealthgrabber.formatters import JsonFormatter
+from wealthgrabber.models import AccountData, ActivityData, PositionData
+
+requires_orjson = pytest.mark.skipif(
+    formatters.orjson is None, reason="orjson not installed"
+)
+
+_ACCOUNTS = (
+    AccountData("My TFSA", "TFSA-001", 5000.0, "CAD"),
+    AccountData("Compte d'épargne", "SAV-001", 0.1 + 0.2, "CAD"),
+)
+_ACTIVITIES = (
+    ActivityData("2024-01-15", "DIY_BUY", "Buy 10 XEQT", 300.5, "CAD", "-"),
+    ActivityData(
+        "2024-01-10", "DIVIDEND", "Réinvestissement VFV", 12.0, "CAD", "+", "TFSA (1)"
+    ),
+)
+_POSITIONS = (
+    PositionData(
+        "XEQT", "iShares Core Equity ETF", 100.5, 2525.0, 2400.0, "CAD", 125.0, 5.2
+    ),
+    PositionData("VFV", "Vanguard S&P 500", 50.0, 3150.0, 3150.0, "CAD", 0.0, 0.0),
+)
+
+
+def _render(monkeypatch, dumps, method, records, **kwargs) -> str:
+    """Render records with JsonFormatter using the given serializer."""
+    monkeypatch.setattr(formatters, "_dumps", dumps)
+    out = io.StringIO()
+    getattr(JsonFormatter, method)(records, out, **kwargs)
+    return out.getvalue()
+
+
+_RENDER_CASES = pytest.mark.parametrize(
+    "method,records,kwargs",
+    [
+        pytest.param("format_accounts", _ACCOUNTS, {}, id="accounts"),
+        pytest.param("format_activities", _ACTIVITIES, {}, id="activities"),
+        pytest.param("format_positions", _POSITIONS, {}, id="positions"),
+        pytest.param(
+            "format_positions",
+            _POSITIONS,
+            {"group_label": "Épargne (TFSA-001)"},
+            id="positions_grouped",
+        ),
+    ],
+)
+
+
+@pytest.mark.parametrize(
+    "items,indent",
+    [
+        pytest.param([], "", id="empty"),
+        pytest.param([{"a": 1}], "", id="single"),
+        pytest.param([{"a": 1, "b": [1, 2]}, {"c": "Épargne"}], "", id="several"),
+        pytest.param([{"a": 1}, {"b": None}], "  ", id="nested"),
+    ],
+)
+def test_write_json_array_matches_json_dumps(monkeypatch, items, indent):
+    """Test the streamed array matches dumping the whole list at once."""
+    monkeypatch.setattr(formatters, "_dumps", formatters._stdlib_dumps)
+    out = io.StringIO()
+    formatters._write_json_array(out, iter(items), indent)
+    expected = json.dumps(items, indent=2).replace("\n", "\n" + indent)
+    assert out.getvalue() == expected
+
+
+@_RENDER_CASES
+def test_json_output_matches_stdlib_document(monkeypatch, method, records, kwargs):
+    """Test streamed JSON output equals dumping the parsed document whole."""
+    text = _render(monkeypatch, formatters._stdlib_dumps, method, records, **kwargs)
+    assert text == json.dumps(json.loads(text), indent=2) + "\n"
+
+
+@requires_orjson
+@_RENDER_CASES
+def test_orjson_output_matches_stdlib(monkeypatch, method, records, kwargs):
+    """Test the orjson path writes the same text as the stdlib path."""
+    expected = _render(monkeypatch, formatters._stdlib_dumps, method, records, **kwargs)
+    actual = _render(monkeypatch, formatters._orjson_dumps, method, records, **kwargs)
+    assert actual == expected
+
+
+@requires_orjson
+def test_orjson_dumps_escapes_non_ascii():
+    """Test non-ASCII text keeps its \\u escapes on the orjson path."""
+    assert formatters._orjson_dumps({"name": "Épargne"}) == (
+        '{\n  "name": "\\u00c9pargne"\n}'
+    )
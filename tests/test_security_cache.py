@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from wealthgrabber import security_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory with no loaded state."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(security_cache, "_entries", None)
+    monkeypatch.setattr(security_cache, "_dirty", False)
+    return tmp_path / "wealthgrabber" / "securities.json"
+
+
+def test_get_market_data_missing():
+    """Test cache miss returns None."""
+    assert security_cache.get_market_data("sec-s-abc") is None
+
+
+def test_set_and_get_market_data():
+    """Test stored market data is returned on lookup."""
+    data = {"stock": {"symbol": "XEQT", "name": "iShares Equity ETF"}}
+    assert security_cache.set_market_data("sec-s-abc", data) == data
+    assert security_cache.get_market_data("sec-s-abc") == data
+
+
+def test_get_market_data_expired(monkeypatch):
+    """Test entries older than the TTL are ignored."""
+    security_cache.set_market_data("sec-s-abc", {"stock": {"symbol": "XEQT"}})
+    now = security_cache.time.time()
+    monkeypatch.setattr(
+        security_cache.time,
+        "time",
+        lambda: now + security_cache.CACHE_TTL_SECONDS + 1,
+    )
+    assert security_cache.get_market_data("sec-s-abc") is None
+
+
+def test_save_and_reload(isolated_cache, monkeypatch):
+    """Test entries persist to disk and are loaded lazily by a fresh process."""
+    data = {"stock": {"symbol": "VFV", "name": "Vanguard S&P 500"}}
+    security_cache.set_market_data("sec-s-vfv", data)
+    security_cache.save()
+
+    assert json.loads(isolated_cache.read_text())["sec-s-vfv"]["data"] == data
+
+    monkeypatch.setattr(security_cache, "_entries", None)
+    assert security_cache.get_market_data("sec-s-vfv") == data
+
+
+def test_load_corrupt_file(isolated_cache):
+    """Test a corrupt cache file is treated as empty."""
+    isolated_cache.parent.mkdir(parents=True)
+    isolated_cache.write_text("not json")
+    assert security_cache.get_market_data("sec-s-abc") is None
+
+
+def test_prefetch_resolves_each_missing_id_once():
+    """Test prefetch skips cached and empty IDs and looks up the rest once."""
+    calls = []
+
+    def fetch(security_id):
+        calls.append(security_id)
+        return security_id.upper()
+
+    cache = {"sec-s-cached": "CACHED"}
+    security_cache.prefetch(
+        ["sec-s-a", "sec-s-b", "sec-s-a", "", "sec-s-cached"], fetch, cache
+    )
+
+    assert sorted(calls) == ["sec-s-a", "sec-s-b"]
+    assert cache == {
+        "sec-s-cached": "CACHED",
+        "sec-s-a": "SEC-S-A",
+        "sec-s-b": "SEC-S-B",
+    }